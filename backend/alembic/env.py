@@ -0,0 +1,35 @@
+"""Alembic environment: migrates the database configured in Django settings to the api.models schema."""
+import os
+
+import django
+from alembic import context
+from django.conf import settings
+
+if not settings.configured:  # Invoked through the alembic CLI rather than manage.py
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+    django.setup()
+
+from api.models import Base, get_engine, url  # noqa: E402
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Emit the migration SQL to stdout (`--sql`) instead of running it."""
+    context.configure(url=url, target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run the migrations on a connection from the application engine."""
+    with get_engine().connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,42 @@
+"""Users and posts tables
+
+Databases created by the former import-time `create_all` already have these
+tables; they are left as they are.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('username', sa.String(), nullable=False, unique=True),
+        sa.Column('email', sa.String(), nullable=False, unique=True),
+        sa.Column('password', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'posts',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('content', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('author_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table('posts')
+    op.drop_table('users')
@@ -0,0 +1,22 @@
+"""Composite (created_at, id) indexes for keyset pagination
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], if_not_exists=True)
+    op.create_index('ix_posts_created_at_id', 'posts', ['created_at', 'id'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_posts_created_at_id', table_name='posts')
+    op.drop_index('ix_users_created_at_id', table_name='users')
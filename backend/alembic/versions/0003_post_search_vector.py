@@ -0,0 +1,35 @@
+"""Full-text search document on posts
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    # Same document as api.models.search_document
+    op.execute(
+        "UPDATE posts SET search_vector = "
+        "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english'::regconfig, coalesce(content, '')), 'B') "
+        "WHERE search_vector IS NULL"
+    )
+    # CONCURRENTLY keeps posts writable during the build; it cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_posts_search_vector', 'posts', ['search_vector'], postgresql_using='gin',
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_posts_search_vector', table_name='posts', postgresql_concurrently=True)
+    op.drop_column('posts', 'search_vector')
@@ -0,0 +1,23 @@
+"""updated_at row versions on users and posts
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ('users', 'posts'):
+        op.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS updated_at timestamp without time zone")
+        op.execute(f"UPDATE {table} SET updated_at = created_at WHERE updated_at IS NULL")
+
+
+def downgrade():
+    op.drop_column('posts', 'updated_at')
+    op.drop_column('users', 'updated_at')
@@ -0,0 +1,26 @@
+"""Composite (author_id, created_at, id) index for per-author post lists
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY keeps posts writable during the build; it cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_posts_author_id_created_at_id', 'posts', ['author_id', 'created_at', 'id'],
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_posts_author_id_created_at_id', table_name='posts', postgresql_concurrently=True)
@@ -0,0 +1,27 @@
+"""posts.idempotency_key: lets the write-behind queue insert each accepted post at most once
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('posts', sa.Column('idempotency_key', sa.String(), nullable=True))
+    # Partial: posts created synchronously have no key and stay out of the index
+    op.create_index(
+        'ix_posts_idempotency_key', 'posts', ['idempotency_key'], unique=True,
+        postgresql_where=sa.text('idempotency_key IS NOT NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_posts_idempotency_key', table_name='posts')
+    op.drop_column('posts', 'idempotency_key')
@@ -0,0 +1,27 @@
+"""users.posts_count: denormalized post count, so user lists need no COUNT per user
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('posts_count', sa.Integer(), nullable=False, server_default='0'))
+    # One aggregate over posts instead of a COUNT per user (same result as `manage.py reconcile_posts_counts`)
+    op.execute(
+        "UPDATE users SET posts_count = counts.n "
+        "FROM (SELECT author_id, count(*) AS n FROM posts GROUP BY author_id) AS counts "
+        "WHERE users.id = counts.author_id"
+    )
+
+
+def downgrade():
+    op.drop_column('users', 'posts_count')
@@ -0,0 +1,172 @@
+import math
+import random
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from .instrumentation import MeasuredJSONRenderer
+from .models import primary_reads, replica_configured
+
+# Shared renderer instance; JSONRenderer is stateless.
+_renderer = MeasuredJSONRenderer()
+
+
+def render_json(data) -> bytes:
+    """Render serializer output to the exact JSON bytes DRF would send."""
+    return _renderer.render(data)
+
+
+def splice_results(envelope: dict, results_json: bytes) -> bytes:
+    """
+    Render a pagination envelope around pre-rendered `results` bytes.
+    The cached results are copied into the body as-is, without being decoded.
+    """
+    head = render_json(envelope)[:-1]  # Drop the closing brace
+    separator = b"," if envelope else b""
+    return head + separator + b'"results":' + results_json + b"}"
+
+
+def json_response(body: bytes, status: int = 200) -> HttpResponse:
+    """Wrap already-rendered JSON bytes in a response."""
+    return HttpResponse(body, status=status, content_type="application/json")
+
+
+LOCK_TIMEOUT = 10  # Seconds one recompute may hold a key's lock
+LOCK_POLL_INTERVAL = 0.05  # Seconds between checks while waiting for another worker's recompute
+STALE_TTL = 300  # Seconds an expired value may still be served while it is being refreshed
+
+# Compare-and-delete in one step: a lock that expired and was taken by another worker stays theirs
+_RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _release_lock(lock_key: str, token: str):
+    """Delete `lock_key` if it still holds `token`, atomically (lock keys never go through a local tier)."""
+    key = cache.make_and_validate_key(lock_key)
+    backend = cache._cache
+    backend.get_client(key, write=True).eval(_RELEASE_LOCK, 1, key, backend._serializer.dumps(token))
+
+
+def _recently_modified(key: str) -> bool:
+    """
+    Whether the namespace `key` belongs to was written within REPLICA_STICKY_SECONDS.
+    A replica may not have those writes yet, and a value computed from it would be
+    cached under the new generation, so such values are computed on the primary.
+    """
+    if not replica_configured():
+        return False
+    modified = get_last_modified(key.split(":", 1)[0])
+    return modified is not None and time.time() - modified < getattr(settings, "REPLICA_STICKY_SECONDS", 5)
+
+
+def _recompute(key, compute, timeout: int):
+    start = time.monotonic()
+    with primary_reads(_recently_modified(key)):
+        value = compute()
+    delta = time.monotonic() - start
+    # Kept in Redis past its logical expiry so it can be served stale during a refresh
+    cache.set(key, (value, time.time() + timeout, delta), timeout=timeout + STALE_TTL)
+    return value
+
+
+def get_or_compute(key: str, compute, timeout: int = 3600, beta: float = 1.0):
+    """
+    Return the cached value for `key`, computing it with `compute()` when needed,
+    without letting concurrent misses stampede the database.
+
+    - Single flight: only the request holding `lock:<key>` (a Redis SET NX) recomputes.
+    - Stale-while-revalidate: an expired value is served to everyone else during the refresh.
+    - Probabilistic early expiration (XFetch): a request may refresh a value shortly before it
+      expires, more eagerly the longer it took to compute, so hot keys rarely expire at all.
+
+    With no value at all (first use or after `cache.delete(key)`) other requests wait for the
+    lock holder's result, up to LOCK_TIMEOUT, then compute it themselves.
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        value, expires_at, delta = entry
+        if time.time() - delta * beta * math.log(1.0 - random.random()) < expires_at:
+            return value
+
+    lock_key = f"lock:{key}"  # Outside the key's prefix, so never held in a local cache tier
+    token = uuid.uuid4().hex
+    if cache.add(lock_key, token, timeout=LOCK_TIMEOUT):
+        try:
+            return _recompute(key, compute, timeout)
+        finally:
+            _release_lock(lock_key, token)
+
+    if entry is not None:
+        return entry[0]  # Someone else is refreshing it
+
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+        if cache.get(lock_key) is None:
+            break  # The lock holder gave up without storing a value
+    return _recompute(key, compute, timeout)
+
+
+# Cache namespaces: every key in a namespace embeds its current generation, so
+# bumping the generation makes all of them unreachable at once, however many there are.
+USERS_NAMESPACE = "users"
+POSTS_NAMESPACE = "posts"  # Post pages embed author data, so user writes bump it too
+
+
+def _generation_key(namespace: str) -> str:
+    return f"generation:{namespace}"
+
+
+def _initial_generation() -> int:
+    # Time-based, so a counter lost from Redis never restarts at a generation still in use
+    return int(time.time() * 1000)
+
+
+def _modified_key(namespace: str) -> str:
+    return f"generation:{namespace}:modified"
+
+
+def get_generation(namespace: str) -> int:
+    """Current generation of `namespace`, creating the counter on first use."""
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, _initial_generation(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def namespaced_key(namespace: str, key: str) -> str:
+    """Cache key for `key` in the current generation of `namespace`."""
+    return f"{namespace}:{get_generation(namespace)}:{key}"
+
+
+def get_last_modified(namespace: str):
+    """Unix time of the last `bump_generation` of `namespace`, or None if never bumped."""
+    return cache.get(_modified_key(namespace))
+
+
+def bump_generation(*namespaces: str):
+    """Atomically advance each namespace's generation (Redis INCR), invalidating all its keys."""
+    for namespace in namespaces:
+        key = _generation_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:  # Counter missing: nothing can be cached under it yet
+            cache.add(key, _initial_generation(), timeout=None)
+        cache.set(_modified_key(namespace), time.time(), timeout=None)
+
+
+async def abump_generation(*namespaces: str):
+    """Async variant of `bump_generation`."""
+    await sync_to_async(bump_generation)(*namespaces)
@@ -0,0 +1,299 @@
+"""
+Two-tier cache backend: a per-process LRU (L1) in front of Redis (L2).
+
+Only keys starting with one of LOCAL_CACHE["KEY_PREFIXES"] go through L1; every
+other key (locks, counters) behaves exactly like Django's RedisCache. L1 keeps
+the serialized bytes read from Redis, so each hit still returns a fresh copy
+and the size limit is measured in bytes.
+
+Every write to an L1 key (set, add, delete, incr, ...) evicts it locally and is
+published on a Redis pub/sub channel; a daemon thread in each process evicts
+the same key there, so a `cache.delete()` or generation bump reaches every
+worker. A short L1 TIMEOUT bounds staleness if a message is lost (e.g. while
+the subscriber reconnects, when L1 is also cleared).
+
+Lookups (hit or miss) and write times are reported to api.instrumentation for
+the current request's Server-Timing header, and to api.metrics for Prometheus.
+
+    CACHES = {"default": {
+        "BACKEND": "api.cache_backends.TwoTierRedisCache",
+        "LOCATION": "redis://127.0.0.1:6379/1",
+        "LOCAL_CACHE": {"KEY_PREFIXES": ["posts:"], "MAX_ENTRIES": 1000,
+                        "MAX_BYTES": 32 * 1024 * 1024, "TIMEOUT": 5},
+    }}
+"""
+import functools
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.redis import RedisCache
+
+from .instrumentation import record_cache_lookup, record_cache_write
+from .metrics import observe_cache_lookup, observe_redis_write
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCAL_CACHE = {
+    "KEY_PREFIXES": [],
+    "MAX_ENTRIES": 1000,
+    "MAX_BYTES": 32 * 1024 * 1024,
+    "TIMEOUT": 5,  # Seconds an L1 entry is trusted without hearing from Redis
+    "CHANNEL": "cache:invalidate",
+}
+CLEAR_ALL = "*"
+_MISSING = object()
+RECONNECT_DELAY = 1.0  # Seconds between subscriber reconnect attempts
+
+
+class LocalTier:
+    """
+    The process-wide L1 store, shared by the per-thread backend instances
+    Django creates for one cache alias.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, timeout: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.sender = uuid.uuid4().hex  # Skips our own invalidation messages
+        self.pid = os.getpid()
+        self.subscriber = None
+        self._entries = OrderedDict()  # key -> (expires_at, raw bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"l1_hits": 0, "l1_misses": 0, "l2_hits": 0, "l2_misses": 0}
+
+    def get(self, key):
+        """Return the raw bytes cached for `key`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._pop(key)
+                self.stats["l1_misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["l1_hits"] += 1
+            return entry[1]
+
+    def put(self, key, raw: bytes):
+        """Store raw bytes for `key`, evicting least recently used entries past the limits."""
+        if len(raw) > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (time.monotonic() + self.timeout, raw)
+            self._bytes += len(raw)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def evict(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    def record_l2(self, hit: bool):
+        with self._lock:
+            self.stats["l2_hits" if hit else "l2_misses"] += 1
+
+    def snapshot(self) -> dict:
+        """Counters plus hit rates per tier; L2 is only consulted on L1 misses."""
+        with self._lock:
+            stats = dict(self.stats, l1_entries=len(self._entries), l1_bytes=self._bytes)
+        for tier in ("l1", "l2"):
+            lookups = stats[f"{tier}_hits"] + stats[f"{tier}_misses"]
+            stats[f"{tier}_hit_rate"] = stats[f"{tier}_hits"] / lookups if lookups else 0.0
+        return stats
+
+
+def _measured_write(method):
+    """Count the time a cache write takes towards the request's Server-Timing."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            record_cache_write(elapsed)
+            observe_redis_write(elapsed)
+    return wrapper
+
+
+# One LocalTier per (location, channel) and process
+_tiers = {}
+_tiers_lock = threading.Lock()
+
+
+class TwoTierRedisCache(RedisCache):
+    """Django's RedisCache with a local LRU for selected key prefixes and pub/sub invalidation."""
+
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        local = dict(DEFAULT_LOCAL_CACHE, **params.get("LOCAL_CACHE", {}))
+        self._l1_prefixes = tuple(local["KEY_PREFIXES"])
+        self._channel = local["CHANNEL"]
+        self._tier_key = (tuple(self._servers), self._channel)
+        self._local = local
+
+    @property
+    def local_tier(self) -> LocalTier:
+        """This process' L1, created (with its subscriber thread) on first use and after a fork."""
+        tier = _tiers.get(self._tier_key)
+        if tier is None or tier.pid != os.getpid():
+            with _tiers_lock:
+                tier = _tiers.get(self._tier_key)
+                if tier is None or tier.pid != os.getpid():
+                    tier = LocalTier(self._local["MAX_ENTRIES"], self._local["MAX_BYTES"], self._local["TIMEOUT"])
+                    _tiers[self._tier_key] = tier
+                    self._start_subscriber(tier)
+        return tier
+
+    def reset_connections(self):
+        """Drop the Redis connection pools (e.g. inherited across a fork); new ones open on next use."""
+        self.__dict__.pop("_cache", None)
+
+    def stats(self) -> dict:
+        """L1/L2 hit counters and rates for this process."""
+        return self.local_tier.snapshot()
+
+    def _uses_l1(self, key) -> bool:
+        return bool(self._l1_prefixes) and key.startswith(self._l1_prefixes)
+
+    # Reads
+
+    def get(self, key, default=None, version=None):
+        started = time.perf_counter()
+        value, result = self._get(key, version)
+        elapsed = time.perf_counter() - started
+        record_cache_lookup(result != "miss", elapsed)
+        observe_cache_lookup(key, result, None if result == "l1_hit" else elapsed)
+        return default if result == "miss" else value
+
+    def _get(self, key, version):
+        """(value, "l1_hit" | "l2_hit" | "miss")"""
+        if not self._uses_l1(key):
+            value = super().get(key, _MISSING, version)
+            return (None, "miss") if value is _MISSING else (value, "l2_hit")
+        tier = self.local_tier
+        cache_key = self.make_and_validate_key(key, version=version)
+        raw = tier.get(cache_key)
+        if raw is not None:
+            return self._cache._serializer.loads(raw), "l1_hit"
+        raw = self._cache.get_client(cache_key).get(cache_key)
+        tier.record_l2(raw is not None)
+        if raw is None:
+            return None, "miss"
+        tier.put(cache_key, raw)
+        return self._cache._serializer.loads(raw), "l2_hit"
+
+    # Writes: apply to Redis, then evict locally and in every other process
+
+    @_measured_write
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = super().add(key, value, timeout, version)
+        self._invalidate(key, version)
+        return added
+
+    @_measured_write
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        super().set(key, value, timeout, version)
+        self._invalidate(key, version)
+
+    @_measured_write
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        touched = super().touch(key, timeout, version)
+        self._invalidate(key, version)
+        return touched
+
+    @_measured_write
+    def delete(self, key, version=None):
+        deleted = super().delete(key, version)
+        self._invalidate(key, version)
+        return deleted
+
+    @_measured_write
+    def incr(self, key, delta=1, version=None):
+        value = super().incr(key, delta, version)
+        self._invalidate(key, version)
+        return value
+
+    @_measured_write
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = super().set_many(data, timeout, version)
+        for key in data:
+            self._invalidate(key, version)
+        return failed
+
+    @_measured_write
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        super().delete_many(keys, version)
+        for key in keys:
+            self._invalidate(key, version)
+
+    @_measured_write
+    def clear(self):
+        cleared = super().clear()
+        if self._l1_prefixes:
+            self.local_tier.clear()
+            self._publish(CLEAR_ALL)
+        return cleared
+
+    def _invalidate(self, key, version):
+        if not self._uses_l1(key):
+            return
+        key = self.make_and_validate_key(key, version=version)
+        self.local_tier.evict(key)
+        self._publish(key)
+
+    def _publish(self, key):
+        client = self._cache.get_client(None, write=True)
+        client.publish(self._channel, f"{self.local_tier.sender}:{key}")
+
+    # Subscriber
+
+    def _start_subscriber(self, tier: LocalTier):
+        if not self._l1_prefixes:
+            return
+        tier.subscriber = threading.Thread(
+            target=self._listen, args=(tier,), name=f"cache-invalidation-{self._channel}", daemon=True
+        )
+        tier.subscriber.start()
+
+    def _listen(self, tier: LocalTier):
+        """Evict keys published by other processes; runs until the process exits (or forks away)."""
+        while tier.pid == os.getpid():
+            try:
+                pubsub = self._cache.get_client(None).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+                # Anything published before this point may have been missed
+                tier.clear()
+                for message in pubsub.listen():
+                    if tier.pid != os.getpid():
+                        return
+                    sender, _, key = message["data"].decode().partition(":")
+                    if sender == tier.sender:
+                        continue
+                    if key == CLEAR_ALL:
+                        tier.clear()
+                    else:
+                        tier.evict(key)
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscriber disconnected: {e}")
+                tier.clear()
+                time.sleep(RECONNECT_DELAY)
@@ -0,0 +1,76 @@
+"""
+HTTP validators (ETag / Last-Modified) for conditional GETs.
+
+List responses are validated by their cache namespace generation, so a
+matching `If-None-Match` is answered with 304 from Redis (usually the local
+cache tier) without touching the database. Single objects are validated by
+their `updated_at` row version, plus the author's for posts because the post
+body embeds it; the 304 is returned before any serializer runs.
+"""
+import calendar
+import functools
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_generation, get_last_modified
+
+
+def _timestamp(value) -> int:
+    """Unix seconds for a naive UTC datetime."""
+    return calendar.timegm(value.utctimetuple())
+
+
+def list_validators(namespace: str):
+    """(etag, last_modified) for any list in `namespace`, from its generation counter."""
+    etag = quote_etag(f"{namespace}-{get_generation(namespace)}")
+    last_modified = get_last_modified(namespace)
+    return etag, int(last_modified) if last_modified is not None else None
+
+
+def row_validators(kind: str, *rows):
+    """(etag, last_modified) for a response built from `rows`, each with `id` and `updated_at`."""
+    # Rows written before updated_at existed fall back to their creation time
+    versions = [(row.id, row.updated_at or row.created_at) for row in rows]
+    etag = quote_etag("-".join([kind] + [f"{row_id}.{version.isoformat()}" for row_id, version in versions]))
+    return etag, max(_timestamp(version) for _, version in versions)
+
+
+def not_modified(request, etag: str, last_modified: int = None):
+    """A 304 response if the request's conditional headers match, else None."""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        add_validators(response, etag, last_modified)
+    return response
+
+
+def add_validators(response, etag: str, last_modified: int = None):
+    """
+    Set ETag/Last-Modified on `response`. `no-cache` makes clients revalidate on
+    every request instead of reusing the body on heuristic freshness.
+    """
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def conditional_list(namespace: str):
+    """
+    Decorator for viewset `list` methods whose output only changes when `namespace`
+    is bumped: answers matching conditional requests with 304 before the view runs.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            etag, last_modified = list_validators(namespace)
+            response = not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                add_validators(response, etag, last_modified)
+            return response
+        return wrapper
+    return decorator
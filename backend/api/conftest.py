@@ -1,8 +1,22 @@
 import pytest
+from contextlib import contextmanager
+from django.core.management import call_command
 from rest_framework.test import APIClient
-from api.models import User, Post, sessionmaker, engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import OperationalError
+from api import models
+from api.models import Base, User, Post, Session
+from api.cache import POSTS_NAMESPACE, USERS_NAMESPACE, bump_generation
 import datetime
 
+@pytest.fixture(scope="session", autouse=True)
+def migrated_schema():
+    """
+    Brings the users/posts schema up to date with the Alembic migrations before any test runs.
+    """
+    call_command("migrate_db", verbosity=0)
+
 @pytest.fixture
 def api_client():
     """
@@ -10,13 +24,38 @@ def api_client():
     """
     return APIClient()
 
+@pytest.fixture
+def max_queries():
+    """
+    Returns a context manager that fails the test when its block runs more SQL
+    statements than allowed, so N+1 regressions break the build:
+
+        with max_queries(1):
+            api_client.get('/api/v1/posts/')
+    """
+    @contextmanager
+    def check(limit):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+        assert len(statements) <= limit, f"{len(statements)} queries, expected at most {limit}:\n" + "\n".join(statements)
+    return check
+
 @pytest.fixture
 def db_session():
     """
     Creates a new database session for testing.
     Ensures the session is rolled back and tables are cleaned up after each test.
     """
-    Session = sessionmaker(bind=engine)
+    # Rows written straight to the DB bypass the views, so start from fresh cache namespaces
+    bump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)
     session = Session()
     yield session  # Provide session to the test
     session.rollback()  # Rollback any uncommitted changes
@@ -25,6 +64,53 @@ def db_session():
     session.commit()  # Ensure changes are persisted
     session.close()  # Close session
 
+@pytest.fixture
+def replica_engine(monkeypatch, db_session):
+    """
+    Routes reads to a second local database, `<NAME>_replica`, standing in for a read replica:
+    same tables, but only the rows a test writes to it. Skipped when that database does not exist
+    (`createdb -O meuusuario meubanco_replica`). Yields an engine on the replica database.
+    """
+    primary_url = make_url(models.url)
+    replica_url = primary_url.set(database=f"{primary_url.database}_replica").render_as_string(hide_password=False)
+    engine = create_engine(replica_url)
+    try:
+        # Recreated every time, so the stand-in follows model changes
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+    except OperationalError:
+        engine.dispose()
+        pytest.skip("replica database not available")
+    monkeypatch.setattr(models, 'replica_url', replica_url)
+    monkeypatch.setattr(models, '_replica_engine', None)
+    monkeypatch.setattr(models, '_replica_checked_at', 0.0)
+    monkeypatch.setattr(models, '_replica_down_until', 0.0)
+    yield engine
+    if models._replica_engine is not None:
+        models._replica_engine.dispose()
+    with engine.begin() as connection:
+        connection.execute(Post.__table__.delete())
+        connection.execute(User.__table__.delete())
+    engine.dispose()
+
+@pytest.fixture
+def post_queue_stream(monkeypatch, db_session):
+    """
+    Points the write-behind queue at streams and ticket keys of its own and deletes them afterwards.
+    """
+    from api import post_queue
+    monkeypatch.setattr(post_queue, 'STREAM', 'test_post_queue:stream')
+    monkeypatch.setattr(post_queue, 'DEAD_LETTER_STREAM', 'test_post_queue:dead')
+    monkeypatch.setattr(post_queue, 'TICKET_PREFIX', 'test_post_queue:ticket:')
+    client = post_queue.get_client()
+    client.delete(post_queue.STREAM, post_queue.DEAD_LETTER_STREAM)
+    post_queue.ensure_group(client)
+    yield client
+    client.delete(post_queue.STREAM, post_queue.DEAD_LETTER_STREAM)
+    tickets = list(client.scan_iter(match=f'{post_queue.TICKET_PREFIX}*'))
+    if tickets:
+        client.delete(*tickets)
+
 @pytest.fixture
 def sample_user(db_session):
     user = User(username="testuser", email="test@example.com", password="password")
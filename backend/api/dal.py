@@ -1,174 +1,476 @@
 # dal.py - Data Access Layer (DAL)
-from sqlalchemy.orm import Session, joinedload, sessionmaker
-from .models import User, Post, engine
-from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import Session, defer, joinedload, load_only, object_session, with_expression
+from .models import User, Post, get_read_engine, SEARCH_CONFIG, search_document
+from .db import is_foreign_key_violation, session_scope
+from .filters import POST_EXCERPT_LENGTH, POST_LIST_FIELDS, created_range
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from collections import Counter
+from sqlalchemy import REAL, Integer, bindparam, cast, column, func, insert, literal, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+
+def _keyset_page(query, model, limit: int, after=None, before=None, descending: bool = True):
+    """
+    Apply keyset pagination on (created_at, id), newest first (oldest first when not `descending`).
+    `after` returns the rows following the given (created_at, id) position in that order,
+    `before` the rows preceding it; both come back in the requested order.
+    """
+    key = tuple_(model.created_at, model.id)
+    newest_first = (model.created_at.desc(), model.id.desc())
+    oldest_first = (model.created_at.asc(), model.id.asc())
+    forward, backward = (newest_first, oldest_first) if descending else (oldest_first, newest_first)
+    if before is not None:
+        condition = key > tuple_(*before) if descending else key < tuple_(*before)
+        rows = query.filter(condition).order_by(*backward).limit(limit).all()
+        return rows[::-1]
+    if after is not None:
+        query = query.filter(key < tuple_(*after) if descending else key > tuple_(*after))
+    return query.order_by(*forward).limit(limit).all()
+
+
+def post_excerpt(length: int):
+    """
+    The first `length` characters of a post's content, computed by Postgres. Lists read
+    this instead of the content; left() only needs the leading slice of a TOASTed value.
+    """
+    return func.left(Post.content, length)
+
+
+def post_list_options(excerpt_length: int):
+    """ORM loader options for post lists: no content, an excerpt instead."""
+    return defer(Post.content), with_expression(Post.excerpt, post_excerpt(excerpt_length))
+
+
+def posts_count_update(deltas: dict):
+    """
+    One UPDATE adding `deltas` ({author_id: change}) to users.posts_count, or None when
+    nothing changes. Run it in the same transaction as the post writes it accounts for.
+    """
+    changes = sorted((author_id, delta) for author_id, delta in deltas.items() if delta)
+    if not changes:
+        return None
+    table = values(column('id', Integer), column('delta', Integer), name='changes').data(changes)
+    return (
+        update(User)
+        .where(User.id == table.c.id)
+        .values(posts_count=User.posts_count + table.c.delta)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bulk_post_insert(stmt, rows: list):
+    """
+    Bind `stmt` (an INSERT into posts) and `rows` so each row's search_vector is computed
+    in the VALUES from its own title and content, writing every row once.
+    Returns (statement, parameters) for an executemany.
+    """
+    params = {key: bindparam(f'b_{key}') for key in rows[0]}
+    params['search_vector'] = search_document(params['title'], params['content'])
+    return stmt.values(params), [{f'b_{key}': value for key, value in row.items()} for row in rows]
+
+
+def _filter_posts(query, author_id: int = None, since=None, until=None):
+    """
+    Restrict a posts query to one author and/or a created_at range.
+    Served by ix_posts_author_id_created_at_id with an author, ix_posts_created_at_id without.
+    """
+    if author_id is not None:
+        query = query.filter(Post.author_id == author_id)
+    return created_range(query, Post, since, until)
+
+
+# Columns projected by the streaming exports (no ORM objects are built)
+USER_EXPORT_COLUMNS = (User.id, User.username, User.email, User.created_at)
+POST_EXPORT_COLUMNS = (Post.id, Post.title, Post.content, Post.created_at, Post.author_id)
+
+
+# Columns read by the serializer-free list path (see api/fastjson.py); the author
+# columns are labelled so one flat row carries both the post and its author
+USER_LIST_COLUMNS = (User.id, User.username, User.email, User.created_at, User.posts_count)
+AUTHOR_COLUMNS = USER_LIST_COLUMNS + (User.updated_at,)  # Embedded author, plus its row version
+AUTHOR_LIST_COLUMNS = (
+    User.id.label('author_id'), User.username.label('author_username'),
+    User.email.label('author_email'), User.created_at.label('author_created_at'),
+    User.posts_count.label('author_posts_count'),
+)
+
+
+def post_list_columns(fields, excerpt_length: int = POST_EXCERPT_LENGTH) -> tuple:
+    """
+    Columns for list rows carrying the response `fields` (see filters.POST_FIELDS).
+    id and created_at are always read: they are the pagination keys. The author columns,
+    and with them the join, are only read when `author` is expanded.
+    """
+    columns = (Post.id, Post.created_at)
+    if 'title' in fields:
+        columns += (Post.title,)
+    if 'excerpt' in fields:
+        columns += (post_excerpt(excerpt_length).label('excerpt'),)
+    if 'author' in fields:
+        return columns + AUTHOR_LIST_COLUMNS
+    if 'author_id' in fields:
+        return columns + (Post.author_id,)
+    return columns
+
+
+POST_LIST_COLUMNS = post_list_columns(POST_LIST_FIELDS)
+
+
+def _post_rows_query(db_session, fields, excerpt_length: int):
+    """Query for post_list_columns(fields) rows, joining the author only when its columns are read."""
+    fields = fields or POST_LIST_FIELDS
+    query = db_session.query(*post_list_columns(fields, excerpt_length))
+    return query.join(Post.author) if 'author' in fields else query
+
+
+def _stream_rows(stmt, batch_size: int):
+    """
+    Yield rows from a server-side cursor, `batch_size` rows per round trip.
+    Uses its own connection, on the read replica when there is one, because streaming
+    responses outlive the request session.
+    """
+    with get_read_engine().connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+        yield from result
+
+
+# ts_headline options for search snippets
+SNIPPET_OPTIONS = 'StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2'
+
+# Characters escaped before content becomes snippet markup; `&` first so later entities stay intact
+HTML_ESCAPES = (('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;'), ('"', '&quot;'), ("'", '&#x27;'))
+
+
+def html_escape(expr):
+    """`expr` with HTML special characters escaped in SQL, like Python's html.escape."""
+    for char, entity in HTML_ESCAPES:
+        expr = func.replace(expr, char, entity)
+    return expr
 
 
 class UserDAL:
     """
     Data Access Layer (DAL) for User operations.
     Provides methods for querying, creating, updating, and deleting users.
+    Without an explicit session, methods use the current request session.
     """
 
     def get_user_by_id(self, user_id: int, session: Session = None):
         """Retrieve a user by ID."""
-        if session:
-            return session.query(User).filter(User.id == user_id).first()
-        else:
-            Session = sessionmaker(bind=engine)
-            db_session = Session()
-            try:
-                return db_session.query(User).filter(User.id == user_id).first()
-            finally:
-                db_session.close()
-
-    def get_all_users_paginated(self, page: int, per_page: int, session: Session = None):
-        """Retrieve a paginated list of users."""
-        if session:
-            return session.query(User).offset((page - 1) * per_page).limit(per_page).all()
-        else:
-            Session = sessionmaker(bind=engine)
-            db_session = Session()
-            try:
-                return db_session.query(User).offset((page - 1) * per_page).limit(per_page).all()
-            finally:
-                db_session.close()
+        with session_scope(session, replica=True) as db_session:
+            return db_session.query(User).filter(User.id == user_id).first()
+
+    def get_all_users_paginated(self, page: int, per_page: int, session: Session = None, peek_next: bool = False):
+        """
+        Retrieve a paginated list of users.
+        With `peek_next`, one extra row is returned so callers can tell whether a next page exists.
+        """
+        limit = per_page + 1 if peek_next else per_page
+        with session_scope(session, replica=True) as db_session:
+            return db_session.query(User).offset((page - 1) * per_page).limit(limit).all()
+
+    def get_users_keyset(self, limit: int, after=None, before=None, session: Session = None):
+        """Retrieve users with keyset pagination on (created_at, id)."""
+        with session_scope(session, replica=True) as db_session:
+            return _keyset_page(db_session.query(User), User, limit, after, before)
+
+    def get_user_rows_paginated(self, page: int, per_page: int, session: Session = None, peek_next: bool = False):
+        """Same page as `get_all_users_paginated`, as USER_LIST_COLUMNS rows instead of ORM objects."""
+        limit = per_page + 1 if peek_next else per_page
+        with session_scope(session, replica=True) as db_session:
+            return db_session.query(*USER_LIST_COLUMNS).offset((page - 1) * per_page).limit(limit).all()
+
+    def get_user_rows_keyset(self, limit: int, after=None, before=None, session: Session = None):
+        """Same page as `get_users_keyset`, as USER_LIST_COLUMNS rows."""
+        with session_scope(session, replica=True) as db_session:
+            return _keyset_page(db_session.query(*USER_LIST_COLUMNS), User, limit, after, before)
+
+    def get_existing_user_ids(self, user_ids, session: Session = None) -> set:
+        """Return which of `user_ids` exist, using a single IN query."""
+        ids = set(user_ids)
+        if not ids:
+            return set()
+        with session_scope(session, replica=True) as db_session:
+            return set(db_session.scalars(select(User.id).where(User.id.in_(ids))))
+
+    def stream_users(self, since=None, until=None, batch_size: int = 1000):
+        """Stream projected user rows created in [since, until), oldest first."""
+        stmt = created_range(select(*USER_EXPORT_COLUMNS), User, since, until).order_by(User.created_at, User.id)
+        return _stream_rows(stmt, batch_size)
+
+    def reconcile_posts_counts(self, user_ids, session: Session = None) -> list:
+        """
+        Recount posts_count for `user_ids` from the posts table, in one UPDATE that only
+        touches users whose stored count drifted; returns the ids it corrected.
+        """
+        actual = select(func.count()).where(Post.author_id == User.id).scalar_subquery()
+        stmt = (
+            update(User)
+            .where(User.id.in_(user_ids), User.posts_count != actual)
+            .values(posts_count=actual)
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        with session_scope(session) as db_session:
+            corrected = db_session.scalars(stmt).all()
+            db_session.commit()
+            return corrected
 
     def create_user(self, user_data: dict, session: Session = None):
         """Create a new user."""
         user = User(**user_data)
-        if session:
-            session.add(user)
-            session.commit()
-            session.refresh(user)
+        with session_scope(session) as db_session:
+            db_session.add(user)
+            db_session.commit()
+            db_session.refresh(user)
             return user
-        else:
-            Session = sessionmaker(bind=engine)
-            db_session = Session()
-            try:
-                db_session.add(user)
-                db_session.commit()
-                db_session.refresh(user)
-                return user
-            finally:
-                db_session.close()
+
+    def bulk_create_users(self, rows: list, session: Session = None):
+        """
+        Insert many users with multi-row INSERTs in one transaction.
+        Rows whose username or email already exists are skipped (ON CONFLICT DO NOTHING);
+        returns (id, username, email, created_at) for the rows actually inserted.
+        """
+        if not rows:
+            return []
+        stmt = (
+            pg_insert(User)
+            .on_conflict_do_nothing()
+            .returning(User.id, User.username, User.email, User.created_at)
+        )
+        with session_scope(session) as db_session:
+            created = db_session.execute(stmt, rows).all()
+            db_session.commit()
+            return created
 
     def update_user(self, user: User, user_data: dict, session: Session = None):
         """Update an existing user."""
         for attr, value in user_data.items():
             setattr(user, attr, value)
-        if session:
-            session.commit()
-        else:
-            Session = sessionmaker(bind=engine)
-            db_session = Session()
-            try:
-                db_session.commit()
-            finally:
-                db_session.close()
+        with session_scope(session or object_session(user)) as db_session:
+            db_session.commit()
         return user
 
     def delete_user(self, user: User, session: Session = None):
         """Delete a user."""
-        if session:
-            session.delete(user)
-            session.commit()
-        else:
-            Session = sessionmaker(bind=engine)
-            db_session = Session()
-            try:
-                db_session.delete(user)
-                db_session.commit()
-            finally:
-                db_session.close()
+        with session_scope(session or object_session(user)) as db_session:
+            db_session.delete(user)
+            db_session.commit()
 
 
 class PostDAL:
     """
     Data Access Layer (DAL) for Post operations.
     Provides methods for querying, creating, updating, and deleting posts.
+    Without an explicit session, methods use the current request session.
     """
 
-    def get_post_by_id(self, post_id: int, session: Session = None):
-        """Retrieve a post by ID."""
-        if session:
-            return session.query(Post).filter(Post.id == post_id).first()
-        else:
-            Session = sessionmaker(bind=engine)
-            db_session = Session()
+    def get_post_by_id(self, post_id: int, session: Session = None, fields=None):
+        """
+        Retrieve a post by ID, including author details.
+        With `fields` (see filters.POST_FIELDS) only those columns, plus the row versions, are
+        loaded, and the author is only joined in when `author` is one of them.
+        """
+        options = [joinedload(Post.author)]
+        if fields is not None:
+            columns = [Post.id, Post.created_at, Post.updated_at]
+            columns += [getattr(Post, name) for name in ('title', 'content', 'author_id') if name in fields]
+            options = [load_only(*columns)]
+            if 'author' in fields:
+                options.append(joinedload(Post.author).load_only(*AUTHOR_COLUMNS))
+        with session_scope(session, replica=True) as db_session:
             try:
-                return db_session.query(Post).filter(Post.id == post_id).first()
+                return db_session.query(Post).options(*options).filter(Post.id == post_id).first()
             except NoResultFound:
                 return None
-            finally:
-                db_session.close()
 
-    def get_all_posts_paginated(self, page: int, per_page: int, session: Session = None):
-        """Retrieve a paginated list of posts, including author details."""
-        if session:
-            return session.query(Post).options(joinedload(Post.author)).offset((page - 1) * per_page).limit(per_page).all()
+    def get_all_posts_paginated(
+        self, page: int, per_page: int, session: Session = None, peek_next: bool = False,
+        excerpt_length: int = POST_EXCERPT_LENGTH,
+    ):
+        """
+        Retrieve a paginated list of posts, newest first, including author details.
+        `content` is not loaded; each post's `excerpt` holds its first `excerpt_length` characters.
+        With `peek_next`, one extra row is returned so callers can tell whether a next page exists.
+        """
+        limit = per_page + 1 if peek_next else per_page
+        with session_scope(session, replica=True) as db_session:
+            return (
+                db_session.query(Post)
+                .options(joinedload(Post.author), *post_list_options(excerpt_length))
+                .order_by(Post.created_at.desc(), Post.id.desc())
+                .offset((page - 1) * per_page)
+                .limit(limit)
+                .all()
+            )
+
+    def get_posts_keyset(
+        self, limit: int, after=None, before=None, session: Session = None, excerpt_length: int = POST_EXCERPT_LENGTH,
+    ):
+        """
+        Retrieve posts with keyset pagination on (created_at, id), including author details.
+        Like `get_all_posts_paginated`, posts carry an `excerpt` instead of their content.
+        """
+        with session_scope(session, replica=True) as db_session:
+            query = db_session.query(Post).options(joinedload(Post.author), *post_list_options(excerpt_length))
+            return _keyset_page(query, Post, limit, after, before)
+
+    def get_post_rows_paginated(
+        self, page: int, per_page: int, session: Session = None, peek_next: bool = False,
+        descending: bool = True, fields=None, excerpt_length: int = POST_EXCERPT_LENGTH, **filters,
+    ):
+        """
+        Same page as `get_all_posts_paginated`, as POST_LIST_COLUMNS rows.
+        Only the columns the list response needs are read, with the author joined in;
+        `fields` and `excerpt_length` shape them as post_list_columns(fields, excerpt_length).
+        `filters` (author_id, since, until) narrow the list; `descending=False` lists oldest first.
+        """
+        limit = per_page + 1 if peek_next else per_page
+        if descending:
+            ordering = (Post.created_at.desc(), Post.id.desc())
         else:
-            Session = sessionmaker(bind=engine)
-            db_session = Session()
-            try:
-                return db_session.query(Post).options(joinedload(Post.author)).offset((page - 1) * per_page).limit(per_page).all()
-            finally:
-                db_session.close()
+            ordering = (Post.created_at.asc(), Post.id.asc())
+        with session_scope(session, replica=True) as db_session:
+            query = _filter_posts(_post_rows_query(db_session, fields, excerpt_length), **filters)
+            return (
+                query
+                .order_by(*ordering)
+                .offset((page - 1) * per_page)
+                .limit(limit)
+                .all()
+            )
+
+    def get_post_rows_keyset(
+        self, limit: int, after=None, before=None, session: Session = None, descending: bool = True,
+        fields=None, excerpt_length: int = POST_EXCERPT_LENGTH, **filters,
+    ):
+        """
+        Same page as `get_posts_keyset`, as POST_LIST_COLUMNS rows, with the same `fields`,
+        `excerpt_length` and filters as `get_post_rows_paginated`.
+        """
+        with session_scope(session, replica=True) as db_session:
+            query = _filter_posts(_post_rows_query(db_session, fields, excerpt_length), **filters)
+            return _keyset_page(query, Post, limit, after, before, descending)
+
+    def stream_posts(self, since=None, until=None, batch_size: int = 1000):
+        """Stream projected post rows created in [since, until), oldest first."""
+        stmt = created_range(select(*POST_EXPORT_COLUMNS), Post, since, until).order_by(Post.created_at, Post.id)
+        return _stream_rows(stmt, batch_size)
 
     def create_post(self, post_data: dict, session: Session = None):
-        """Create a new post and link it to an existing author."""
-        author_id = post_data.get('author_id')
-        if session:
-            author = session.query(User).filter(User.id == author_id).first()
-            if not author:
-                return None
+        """
+        Create a new post for an existing author, or return None if the author does not exist.
+        The author is not looked up first: the posts.author_id foreign key rejects unknown
+        authors, and the post is then read back together with its author in one query.
+        The author's posts_count is incremented in the same transaction.
+        """
+        with session_scope(session) as db_session:
             post = Post(**post_data)
-            post.author = author
-            session.add(post)
-            session.commit()
-            session.refresh(post)
-            return post
-        else:
-            Session = sessionmaker(bind=engine)
-            db_session = Session()
+            post.search_vector = search_document(post.title, post.content)
+            db_session.add(post)
             try:
-                author = db_session.query(User).filter(User.id == author_id).first()
-                if not author:
+                db_session.flush()
+            except IntegrityError as e:
+                db_session.rollback()
+                if is_foreign_key_violation(e):
                     return None
-                post = Post(**post_data)
-                post.author = author
-                db_session.add(post)
-                db_session.commit()
-                db_session.refresh(post)
-                return post
-            finally:
-                db_session.close()
+                raise
+            db_session.execute(posts_count_update({post.author_id: 1}))
+            post_id = post.id  # Read before commit expires the instance
+            db_session.commit()
+            return db_session.get(Post, post_id, options=[joinedload(Post.author)], populate_existing=True)
+
+    def bulk_create_posts(self, rows: list, session: Session = None):
+        """
+        Insert many posts with multi-row INSERTs in one transaction.
+        Authors must already be validated; returns (id, created_at) per row, in input order.
+        Each author's posts_count grows by its number of rows in the same transaction.
+        """
+        if not rows:
+            return []
+        stmt, params = bulk_post_insert(
+            insert(Post).returning(Post.id, Post.created_at, sort_by_parameter_order=True), rows,
+        )
+        with session_scope(session) as db_session:
+            created = db_session.execute(stmt, params).all()
+            db_session.execute(posts_count_update(Counter(row['author_id'] for row in rows)))
+            db_session.commit()
+            return created
+
+    def bulk_create_posts_once(self, rows: list, session: Session = None) -> dict:
+        """
+        Insert posts carrying an `idempotency_key` in one transaction, skipping keys that were
+        already inserted (ON CONFLICT DO NOTHING), so a redelivered batch creates nothing twice.
+        Authors must already be validated; returns {idempotency_key: post id} for every row.
+        """
+        if not rows:
+            return {}
+        stmt, params = bulk_post_insert(
+            pg_insert(Post)
+            .on_conflict_do_nothing(
+                index_elements=[Post.idempotency_key], index_where=Post.idempotency_key.isnot(None),
+            )
+            .returning(Post.id, Post.idempotency_key, Post.author_id),
+            rows,
+        )
+        with session_scope(session) as db_session:
+            created = db_session.execute(stmt, params).all()
+            if created:
+                # Only rows inserted now count; skipped keys were counted when first inserted
+                db_session.execute(posts_count_update(Counter(row.author_id for row in created)))
+            ids = {row.idempotency_key: row.id for row in created}
+            missing = [row['idempotency_key'] for row in rows if row['idempotency_key'] not in ids]
+            if missing:
+                ids.update(db_session.execute(
+                    select(Post.idempotency_key, Post.id).where(Post.idempotency_key.in_(missing))
+                ).all())
+            db_session.commit()
+            return ids
 
     def update_post(self, post: Post, post_data: dict, session: Session = None):
-        """Update an existing post."""
+        """Update an existing post; moving it to another author moves it between their posts_counts."""
+        moved = None
+        if post_data.get('author_id', post.author_id) != post.author_id:
+            moved = posts_count_update({post.author_id: -1, post_data['author_id']: 1})
         for attr, value in post_data.items():
             setattr(post, attr, value)
-        if session:
-            session.commit()
-        else:
-            Session = sessionmaker(bind=engine)
-            db_session = Session()
-            try:
-                db_session.commit()
-            finally:
-                db_session.close()
+        if 'title' in post_data or 'content' in post_data:
+            post.search_vector = search_document(post.title, post.content)
+        with session_scope(session or object_session(post)) as db_session:
+            if moved is not None:
+                db_session.execute(moved)
+            db_session.commit()
         return post
 
+    def search_posts(self, query_text: str, limit: int, after=None, session: Session = None):
+        """
+        Full-text search over title and content, best matches first.
+        `after` is the (rank, id) keyset position of the previous page. Snippets are
+        only computed for the returned rows, from HTML-escaped content, so their <mark>
+        tags are the only markup in them. Returns rows of
+        (id, title, created_at, author_id, rank, snippet).
+        """
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query_text)
+        rank = func.ts_rank_cd(Post.search_vector, tsquery)
+        matches = select(Post.id, rank.label('rank')).where(Post.search_vector.op('@@')(tsquery))
+        if after is not None:
+            # Compare as real, the type ts_rank_cd returns, so equal ranks fall through to the id
+            matches = matches.where(tuple_(rank, Post.id) < tuple_(cast(literal(after[0]), REAL), after[1]))
+        matches = matches.order_by(rank.desc(), Post.id.desc()).limit(limit).subquery()
+        stmt = (
+            select(
+                Post.id, Post.title, Post.created_at, Post.author_id, matches.c.rank,
+                func.ts_headline(SEARCH_CONFIG, html_escape(Post.content), tsquery, SNIPPET_OPTIONS).label('snippet'),
+            )
+            .join(matches, matches.c.id == Post.id)
+            .order_by(matches.c.rank.desc(), Post.id.desc())
+        )
+        with session_scope(session, replica=True) as db_session:
+            return db_session.execute(stmt).all()
+
     def delete_post(self, post: Post, session: Session = None):
-        """Delete a post."""
-        if session:
-            session.delete(post)
-            session.commit()
-        else:
-            Session = sessionmaker(bind=engine)
-            db_session = Session()
-            try:
-                db_session.delete(post)
-                db_session.commit()
-            finally:
-                db_session.close()
+        """Delete a post and decrement its author's posts_count in the same transaction."""
+        with session_scope(session or object_session(post)) as db_session:
+            db_session.execute(posts_count_update({post.author_id: -1}))
+            db_session.delete(post)
+            db_session.commit()
@@ -0,0 +1,136 @@
+# dal_async.py - Async Data Access Layer, mirroring UserDAL/PostDAL on an AsyncSession
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from .filters import POST_EXCERPT_LENGTH
+from .models import User, Post, search_document
+from .dal import post_list_options, posts_count_update
+from .db import is_foreign_key_violation
+
+
+async def _keyset_page(session: AsyncSession, stmt, model, limit: int, after=None, before=None):
+    """Async counterpart of dal._keyset_page: (created_at, id) keyset, newest first."""
+    key = tuple_(model.created_at, model.id)
+    if before is not None:
+        stmt = stmt.where(key > tuple_(*before)).order_by(model.created_at.asc(), model.id.asc()).limit(limit)
+        return list((await session.scalars(stmt)).all())[::-1]
+    if after is not None:
+        stmt = stmt.where(key < tuple_(*after))
+    stmt = stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+    return list((await session.scalars(stmt)).all())
+
+
+class AsyncUserDAL:
+    """
+    Async Data Access Layer for User operations.
+    Same methods as UserDAL, awaited on an AsyncSession.
+    """
+
+    async def get_user_by_id(self, user_id: int, session: AsyncSession):
+        """Retrieve a user by ID."""
+        return await session.get(User, user_id)
+
+    async def get_all_users_paginated(self, page: int, per_page: int, session: AsyncSession, peek_next: bool = False):
+        """Retrieve a paginated list of users."""
+        limit = per_page + 1 if peek_next else per_page
+        stmt = select(User).offset((page - 1) * per_page).limit(limit)
+        return list((await session.scalars(stmt)).all())
+
+    async def get_users_keyset(self, limit: int, after=None, before=None, session: AsyncSession = None):
+        """Retrieve users with keyset pagination on (created_at, id)."""
+        return await _keyset_page(session, select(User), User, limit, after, before)
+
+    async def create_user(self, user_data: dict, session: AsyncSession):
+        """Create a new user."""
+        user = User(**user_data)
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+        return user
+
+    async def update_user(self, user: User, user_data: dict, session: AsyncSession):
+        """Update an existing user."""
+        for attr, value in user_data.items():
+            setattr(user, attr, value)
+        await session.commit()
+        return user
+
+    async def delete_user(self, user: User, session: AsyncSession):
+        """Delete a user."""
+        await session.delete(user)
+        await session.commit()
+
+
+class AsyncPostDAL:
+    """
+    Async Data Access Layer for Post operations.
+    Same methods as PostDAL, awaited on an AsyncSession; authors are always
+    eager-loaded because lazy loads are not available on an AsyncSession.
+    """
+
+    async def get_post_by_id(self, post_id: int, session: AsyncSession):
+        """Retrieve a post by ID, including author details."""
+        stmt = select(Post).options(joinedload(Post.author)).where(Post.id == post_id)
+        return (await session.scalars(stmt)).first()
+
+    async def get_all_posts_paginated(
+        self, page: int, per_page: int, session: AsyncSession, peek_next: bool = False,
+        excerpt_length: int = POST_EXCERPT_LENGTH,
+    ):
+        """Retrieve a paginated list of posts, newest first, including author details and an excerpt."""
+        limit = per_page + 1 if peek_next else per_page
+        stmt = (
+            select(Post)
+            .options(joinedload(Post.author), *post_list_options(excerpt_length))
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .offset((page - 1) * per_page)
+            .limit(limit)
+        )
+        return list((await session.scalars(stmt)).all())
+
+    async def get_posts_keyset(
+        self, limit: int, after=None, before=None, session: AsyncSession = None, excerpt_length: int = POST_EXCERPT_LENGTH,
+    ):
+        """Retrieve posts with keyset pagination on (created_at, id), including author details and an excerpt."""
+        stmt = select(Post).options(joinedload(Post.author), *post_list_options(excerpt_length))
+        return await _keyset_page(session, stmt, Post, limit, after, before)
+
+    async def create_post(self, post_data: dict, session: AsyncSession):
+        """
+        Create a new post for an existing author, or return None if the author does not exist.
+        Like PostDAL.create_post, unknown authors are rejected by the foreign key
+        and the author's posts_count is incremented in the same transaction.
+        """
+        post = Post(**post_data)
+        post.search_vector = search_document(post.title, post.content)
+        session.add(post)
+        try:
+            await session.flush()
+        except IntegrityError as e:
+            await session.rollback()
+            if is_foreign_key_violation(e):
+                return None
+            raise
+        await session.execute(posts_count_update({post.author_id: 1}))
+        await session.commit()
+        return await session.get(Post, post.id, options=[joinedload(Post.author)], populate_existing=True)
+
+    async def update_post(self, post: Post, post_data: dict, session: AsyncSession):
+        """Update an existing post; moving it to another author moves it between their posts_counts."""
+        if post_data.get('author_id', post.author_id) != post.author_id:
+            await session.execute(posts_count_update({post.author_id: -1, post_data['author_id']: 1}))
+        for attr, value in post_data.items():
+            setattr(post, attr, value)
+        if 'title' in post_data or 'content' in post_data:
+            post.search_vector = search_document(post.title, post.content)
+        await session.commit()
+        if 'author_id' in post_data:
+            await session.refresh(post, ['author'])
+        return post
+
+    async def delete_post(self, post: Post, session: AsyncSession):
+        """Delete a post and decrement its author's posts_count in the same transaction."""
+        await session.execute(posts_count_update({post.author_id: -1}))
+        await session.delete(post)
+        await session.commit()
@@ -0,0 +1,119 @@
+import asyncio
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from .metrics import TimedAsyncQueuePool
+from .models import Session, url
+
+# Session bound to the current HTTP request by SQLAlchemySessionMiddleware
+_request_session: ContextVar = ContextVar("sqlalchemy_request_session", default=None)
+
+
+def get_request_session():
+    """Return the session opened for the current request, or None outside a request."""
+    return _request_session.get()
+
+
+def bind_request_session(session):
+    """Make `session` the current request session; returns a token for `unbind_request_session`."""
+    return _request_session.set(session)
+
+
+def unbind_request_session(token):
+    """Restore the request session that was current before `bind_request_session`."""
+    _request_session.reset(token)
+
+
+# SQLSTATE raised by Postgres when a foreign key constraint is violated
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+def is_foreign_key_violation(error) -> bool:
+    """Whether an IntegrityError was caused by a missing referenced row (psycopg2 or asyncpg)."""
+    return getattr(error.orig, "pgcode", None) == FOREIGN_KEY_VIOLATION
+
+
+@contextmanager
+def session_scope(session=None, replica: bool = False):
+    """
+    Yield the session to run a unit of work on.
+    Prefers an explicit `session`, then the request session, and only opens
+    (and closes) a short-lived session when neither exists, e.g. in scripts;
+    with `replica`, that session reads from the read replica.
+    """
+    if session is None:
+        session = _request_session.get()
+    if session is not None:
+        yield session
+        return
+    db_session = Session(replica=replica)
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+
+
+# Async engine (asyncpg) used by the async views; see get_async_engine()
+async_url = make_url(url).set(drivername="postgresql+asyncpg")
+_async_engine = None
+_async_engine_loop = None
+_async_engine_pid = None
+# Set once an engine outlives its loop: loops are then per request and pools are not kept
+_short_lived_loops = False
+
+
+def _retire_async_engine(engine, loop):
+    """
+    Release the pool of an engine whose loop is no longer the running one.
+    A loop still running elsewhere closes its own connections; a closed loop can no
+    longer close them, so the pool is dropped and its connections left to the GC.
+    """
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(engine.dispose(), loop)
+    else:
+        engine.sync_engine.dispose(close=False)
+
+
+def get_async_engine():
+    """
+    Return the async engine for the running event loop.
+    asyncpg connections belong to the loop that opened them. Under ASGI there is
+    a single loop per worker, so every request shares one pool. If a different
+    loop shows up (async views run through WSGI, or tests) the previous engine is
+    retired and a new one made; once a loop has been closed under its engine,
+    loops are assumed to be per request and engines open connections without a
+    pool (NullPool), so nothing is left behind when the loop goes away.
+    A forked child never reuses the pool inherited from its parent.
+    """
+    global _async_engine, _async_engine_loop, _async_engine_pid, _short_lived_loops
+    loop = asyncio.get_running_loop()
+    if _async_engine is None or _async_engine_loop is not loop or _async_engine_pid != os.getpid():
+        if _async_engine is not None and _async_engine_pid != os.getpid():
+            # The inherited connections belong to the parent: forget them without closing
+            _async_engine.sync_engine.dispose(close=False)
+        elif _async_engine is not None:
+            _short_lived_loops = _short_lived_loops or _async_engine_loop.is_closed()
+            _retire_async_engine(_async_engine, _async_engine_loop)
+        options = dict(getattr(settings, 'SQLALCHEMY_ENGINE_OPTIONS', {}))
+        if _short_lived_loops:
+            options.pop('pool_size', None)
+            options.pop('max_overflow', None)
+            _async_engine = create_async_engine(async_url, poolclass=NullPool, **options)
+        else:
+            _async_engine = create_async_engine(
+                async_url, poolclass=TimedAsyncQueuePool, pool_logging_name='async', **options,
+            )
+        _async_engine_loop = loop
+        _async_engine_pid = os.getpid()
+    return _async_engine
+
+
+def async_session() -> AsyncSession:
+    """Open an AsyncSession; use as `async with async_session() as session:`."""
+    return AsyncSession(get_async_engine(), expire_on_commit=False)
@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from django.http import StreamingHttpResponse
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+CHUNK_ROWS = 500  # Rows joined into each chunk written to the socket
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def ndjson_chunks(rows, fields):
+    """Encode rows as newline-delimited JSON, CHUNK_ROWS rows per chunk."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({field: _value(value) for field, value in zip(fields, row)}))
+        if len(lines) >= CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def csv_chunks(rows, fields):
+    """Encode rows as CSV with a header line, CHUNK_ROWS rows per chunk."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    count = 0
+    for row in rows:
+        writer.writerow([_value(value) for value in row])
+        count += 1
+        if count >= CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    yield buffer.getvalue()
+
+
+def streaming_export(rows, fields, output: str, filename: str) -> StreamingHttpResponse:
+    """Stream `rows` (tuples in `fields` order) as an NDJSON or CSV download."""
+    chunks = csv_chunks(rows, fields) if output == "csv" else ndjson_chunks(rows, fields)
+    response = StreamingHttpResponse(chunks, content_type=EXPORT_FORMATS[output])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{output}"'
+    return response
@@ -0,0 +1,80 @@
+"""
+Serializer-free rendering for list endpoints.
+
+List pages are read as flat column rows (dal.USER_LIST_COLUMNS /
+dal.POST_LIST_COLUMNS), mapped straight to dicts and encoded with orjson.
+The bytes match what UserSerializer/PostSerializer + JSONRenderer produce for
+the same rows, so both paths can share cache entries. Writes and validation
+still go through the DRF serializers.
+"""
+import orjson
+
+from .filters import POST_LIST_FIELDS
+from .instrumentation import measure_serialization
+
+# Timestamps are naive UTC columns and TIME_ZONE is UTC, which DRF renders as
+# ISO 8601 with a "Z" suffix (microseconds only when non-zero) - as does orjson.
+_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+# JSONRenderer escapes these two separators for JavaScript compatibility
+_LINE_SEPARATOR = "\u2028".encode()
+_PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+def user_row(row) -> dict:
+    """Map a USER_LIST_COLUMNS row to UserSerializer's output."""
+    return {
+        "id": row.id,
+        "username": row.username,
+        "email": row.email,
+        "created_at": row.created_at,
+        "posts_count": row.posts_count,
+    }
+
+
+def post_row(row) -> dict:
+    """Map a POST_LIST_COLUMNS row to PostSerializer(fields=POST_LIST_FIELDS)'s output, author included."""
+    return {
+        "id": row.id,
+        "title": row.title,
+        "excerpt": row.excerpt,
+        "created_at": row.created_at,
+        "author": _author(row),
+    }
+
+
+def _author(row) -> dict:
+    return {
+        "id": row.author_id,
+        "username": row.author_username,
+        "email": row.author_email,
+        "created_at": row.author_created_at,
+        "posts_count": row.author_posts_count,
+    }
+
+
+def post_row_mapper(fields):
+    """
+    Row mapper for dal.post_list_columns(fields) rows: only `fields`, in the given
+    (filters.POST_FIELDS) order, like PostSerializer(fields=fields).
+    """
+    if tuple(fields) == POST_LIST_FIELDS:
+        return post_row
+    plain = tuple(name for name in fields if name != "author")
+    if "author" not in fields:
+        return lambda row: {name: getattr(row, name) for name in plain}
+
+    def to_dict(row):
+        data = {name: getattr(row, name) for name in plain}
+        data["author"] = _author(row)
+        return data
+    return to_dict
+
+
+def render_rows(rows, to_dict) -> bytes:
+    """Render rows as a JSON array, byte-for-byte like render_json(serializer.data)."""
+    with measure_serialization():
+        body = orjson.dumps([to_dict(row) for row in rows], option=_OPTIONS)
+        if _LINE_SEPARATOR in body or _PARAGRAPH_SEPARATOR in body:
+            body = body.replace(_LINE_SEPARATOR, b"\\u2028").replace(_PARAGRAPH_SEPARATOR, b"\\u2029")
+    return body
@@ -0,0 +1,113 @@
+from datetime import timezone
+
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+
+
+def parse_datetime_param(request, name: str):
+    """
+    Read an ISO 8601 datetime from the query string.
+    Returns None when absent; aware values are converted to naive UTC to match the
+    `timestamp without time zone` columns. Raises ValueError on malformed input.
+    """
+    raw = request.query_params.get(name)
+    if not raw:
+        return None
+    value = parse_datetime(raw)
+    if value is None:
+        raise ValueError(f"{name} must be an ISO 8601 datetime.")
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def created_range(stmt, model, since=None, until=None):
+    """Restrict a select to rows created in [since, until)."""
+    if since is not None:
+        stmt = stmt.where(model.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(model.created_at < until)
+    return stmt
+
+
+# `?ordering=` values accepted by post lists -> newest first
+POST_ORDERINGS = {"-created_at": True, "created_at": False}
+
+
+def parse_int_param(request, name: str):
+    """Read an integer from the query string; None when absent, ValueError when malformed."""
+    raw = request.query_params.get(name)
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer.")
+
+
+def parse_post_filters(request, author_id: int = None) -> dict:
+    """
+    Read the post list filters: `?author_id=`, a `?since=`/`?until=` created_at range
+    and `?ordering=`. A fixed `author_id` (from the nested users route) wins over the
+    query string. Returns keyword arguments for the PostDAL row readers.
+    """
+    ordering = request.query_params.get("ordering") or "-created_at"
+    if ordering not in POST_ORDERINGS:
+        raise ValueError(f"ordering must be one of: {', '.join(POST_ORDERINGS)}.")
+    return {
+        "author_id": author_id if author_id is not None else parse_int_param(request, "author_id"),
+        "since": parse_datetime_param(request, "since"),
+        "until": parse_datetime_param(request, "until"),
+        "descending": POST_ORDERINGS[ordering],
+    }
+
+
+# Fields a post response may carry, in output order. `author_id` is the bare reference,
+# `author` the embedded author object (a join). Lists carry an `excerpt` of the content
+# (computed in SQL) and never the full `content`, which only the post detail returns.
+POST_FIELDS = ("id", "title", "content", "excerpt", "created_at", "author_id", "author")
+POST_DEFAULT_FIELDS = ("id", "title", "content", "created_at", "author")
+POST_LIST_FIELDS = ("id", "title", "excerpt", "created_at", "author")
+POST_EXPANSIONS = ("author",)
+
+# Characters of content in a list excerpt: POST_EXCERPT_LENGTH unless `?excerpt_length=` asks otherwise
+POST_EXCERPT_LENGTH = getattr(settings, "POST_EXCERPT_LENGTH", 200)
+POST_EXCERPT_MAX_LENGTH = 2000
+
+
+def _names(request, name: str) -> set:
+    return {part.strip() for part in request.query_params.get(name, "").split(",") if part.strip()}
+
+
+def parse_post_fields(request, default=POST_DEFAULT_FIELDS, excluded: str = "excerpt") -> tuple:
+    """
+    Read the sparse fieldset: `?fields=id,title,created_at` and `?expand=author`.
+    Returns the post fields to render (and read), in POST_FIELDS order: the listed
+    fields, or `default` without `?fields=`, plus the expansions. The `excluded`
+    field is not available (`excerpt` on the detail, `content` on lists).
+    Raises ValueError on unknown names.
+    """
+    available = tuple(name for name in POST_FIELDS if name != excluded)
+    requested = _names(request, "fields")
+    if requested.difference(available):
+        raise ValueError(f"fields must be among: {', '.join(available)}.")
+    expand = _names(request, "expand")
+    if expand.difference(POST_EXPANSIONS):
+        raise ValueError(f"expand must be among: {', '.join(POST_EXPANSIONS)}.")
+    requested = (requested or set(default)) | expand
+    return tuple(name for name in POST_FIELDS if name in requested)
+
+
+def parse_post_list_fields(request) -> tuple:
+    """`parse_post_fields` for post lists: excerpts instead of content."""
+    return parse_post_fields(request, default=POST_LIST_FIELDS, excluded="content")
+
+
+def parse_excerpt_length(request) -> int:
+    """Read `?excerpt_length=` (1 to POST_EXCERPT_MAX_LENGTH characters), defaulting to POST_EXCERPT_LENGTH."""
+    length = parse_int_param(request, "excerpt_length")
+    if length is None:
+        return POST_EXCERPT_LENGTH
+    if not 1 <= length <= POST_EXCERPT_MAX_LENGTH:
+        raise ValueError(f"excerpt_length must be between 1 and {POST_EXCERPT_MAX_LENGTH}.")
+    return length
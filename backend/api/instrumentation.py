@@ -0,0 +1,142 @@
+"""
+Per-request performance counters: SQL statements, cache operations and serialization.
+
+RequestMetricsMiddleware binds a RequestMetrics to the current context for
+every request; SQLAlchemy cursor events (on every engine, sync or async), the
+cache backend and the serializers/renderers add to it. The totals go out in a
+`Server-Timing` header, which browser dev tools display per request, and in one
+log record per request on the "api.requests" logger:
+
+    Server-Timing: db;dur=4.1;desc="3 queries", cache;dur=0.8;desc="2 hits, 1 miss",
+                   serialize;dur=1.2, total;dur=12.3
+
+Outside a request (scripts, management commands) nothing is recorded.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from rest_framework.renderers import JSONRenderer
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("api.requests")
+
+_current_metrics: ContextVar = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Counters for one request; durations are in seconds."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_time = 0.0
+        self.serialize_time = 0.0
+        self._serialize_depth = 0  # Nested serializers are timed once, by the outermost
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> dict:
+        """Counters with durations in milliseconds, for structured logs."""
+        return {
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_time * 1000, 2),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_ms": round(self.cache_time * 1000, 2),
+            "serialize_ms": round(self.serialize_time * 1000, 2),
+            "total_ms": round(self.elapsed() * 1000, 2),
+        }
+
+    def server_timing(self) -> str:
+        """The `Server-Timing` header value."""
+        values = self.as_dict()
+        return ", ".join([
+            f'db;dur={values["db_ms"]};desc="{self.db_queries} queries"',
+            f'cache;dur={values["cache_ms"]};desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f'serialize;dur={values["serialize_ms"]}',
+            f'total;dur={values["total_ms"]}',
+        ])
+
+
+def current_metrics():
+    """The RequestMetrics of the request being handled, or None."""
+    return _current_metrics.get()
+
+
+def start_request_metrics():
+    """Start counting for a new request; returns (metrics, token for `stop_request_metrics`)."""
+    metrics = RequestMetrics()
+    return metrics, _current_metrics.set(metrics)
+
+
+def stop_request_metrics(token):
+    _current_metrics.reset(token)
+
+
+# SQL: every engine, including the sync engine under each AsyncEngine
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_metrics.get() is not None:
+        context._metrics_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current_metrics.get()
+    started = getattr(context, "_metrics_started", None)
+    if metrics is not None and started is not None:
+        metrics.db_queries += 1
+        metrics.db_time += time.perf_counter() - started
+
+
+# Cache: called by api.cache_backends.TwoTierRedisCache
+
+def record_cache_lookup(hit: bool, seconds: float):
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        if hit:
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+        metrics.cache_time += seconds
+
+
+def record_cache_write(seconds: float):
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.cache_time += seconds
+
+
+# Serialization: serializers' to_representation and JSON rendering
+
+@contextmanager
+def measure_serialization():
+    """Add the time spent in the block to the request's serialize total."""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    metrics._serialize_depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._serialize_depth -= 1
+        if not metrics._serialize_depth:
+            metrics.serialize_time += time.perf_counter() - started
+
+
+class MeasuredJSONRenderer(JSONRenderer):
+    """DRF's JSONRenderer, with its encoding time counted as serialization."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with measure_serialization():
+            return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,44 @@
+import os
+import socket
+
+from django.core.management.base import BaseCommand
+
+from api import post_queue
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert posts accepted in write-behind mode (POST_WRITE_BEHIND) from the Redis stream, "
+        "one transaction and one cache invalidation per batch. Run one or more of these next to the web workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--block-ms", type=int, default=5000, help="How long to wait for new entries per read.")
+        parser.add_argument(
+            "--consumer", default=f"{socket.gethostname()}-{os.getpid()}",
+            help="Consumer name within the group; defaults to host and pid.",
+        )
+        parser.add_argument("--once", action="store_true", help="Exit once the stream is empty.")
+
+    def handle(self, *args, **options):
+        client = post_queue.get_client()
+        post_queue.ensure_group(client)
+        totals = {"created": 0, "failed": 0}
+        try:
+            while True:
+                entries = post_queue.read_batch(
+                    client, options["consumer"], options["batch_size"], None if options["once"] else options["block_ms"],
+                )
+                if not entries:
+                    if options["once"]:
+                        break
+                    continue
+                counts = post_queue.process_batch(client, entries)
+                for key, value in counts.items():
+                    totals[key] += value
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"{counts['created']} created, {counts['failed']} failed")
+        except KeyboardInterrupt:
+            pass  # Unacknowledged entries are claimed again by the next worker
+        self.stdout.write(self.style.SUCCESS(f"Queue drained ({totals['created']} created, {totals['failed']} failed)."))
@@ -0,0 +1,47 @@
+from alembic import command
+from alembic.config import Config
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+def alembic_config() -> Config:
+    """Alembic configuration for the SQLAlchemy schema, independent of the working directory."""
+    config = Config(str(settings.BASE_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(settings.BASE_DIR / "alembic"))
+    return config
+
+
+class Command(BaseCommand):
+    help = (
+        "Manage the SQLAlchemy schema with Alembic migrations (alembic/versions). "
+        "Without arguments, upgrades the database to the latest revision."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action", nargs="?", default="upgrade",
+            choices=["upgrade", "downgrade", "current", "history", "check", "revision"],
+        )
+        parser.add_argument("revision", nargs="?", help="Target revision (default: head for upgrade).")
+        parser.add_argument("-m", "--message", help="Message for a new revision.")
+        parser.add_argument("--autogenerate", action="store_true", help="Diff the models against the database for a new revision.")
+        parser.add_argument("--sql", action="store_true", help="Print the SQL for upgrade/downgrade instead of running it.")
+
+    def handle(self, *args, **options):
+        config = alembic_config()
+        action, revision = options["action"], options["revision"]
+        if action == "upgrade":
+            command.upgrade(config, revision or "head", sql=options["sql"])
+        elif action == "downgrade":
+            if not revision:
+                self.stderr.write("downgrade needs a target revision, e.g. -1 or base.")
+                return
+            command.downgrade(config, revision, sql=options["sql"])
+        elif action == "current":
+            command.current(config, verbose=options["verbosity"] > 1)
+        elif action == "history":
+            command.history(config)
+        elif action == "check":
+            command.check(config)
+        elif action == "revision":
+            command.revision(config, message=options["message"], autogenerate=options["autogenerate"])
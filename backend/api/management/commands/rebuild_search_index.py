@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from sqlalchemy import select, update
+
+from api.models import Post, Session, search_document
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill posts.search_vector in batches. The column and its GIN index "
+        "come from the migrations (python manage.py migrate_db)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--all", action="store_true", help="Recompute every post, not only missing vectors.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        updated = 0
+        last_id = 0
+        with Session() as db_session:
+            while True:
+                stmt = select(Post.id).where(Post.id > last_id).order_by(Post.id).limit(batch_size)
+                if not options["all"]:
+                    stmt = stmt.where(Post.search_vector.is_(None))
+                ids = db_session.scalars(stmt).all()
+                if not ids:
+                    break
+                db_session.execute(
+                    update(Post)
+                    .where(Post.id.in_(ids))
+                    .values(search_vector=search_document(Post.title, Post.content))
+                    .execution_options(synchronize_session=False)
+                )
+                db_session.commit()
+                updated += len(ids)
+                last_id = ids[-1]
+                self.stdout.write(f"{updated} posts indexed")
+
+        self.stdout.write(self.style.SUCCESS(f"Search index up to date ({updated} posts updated)."))
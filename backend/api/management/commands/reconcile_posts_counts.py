@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from sqlalchemy import select
+
+from api.cache import POSTS_NAMESPACE, USERS_NAMESPACE, bump_generation
+from api.dal import UserDAL
+from api.models import Session, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount users.posts_count from the posts table in batches and correct the users "
+        "whose stored count drifted (rows written around PostDAL, e.g. COPY or raw SQL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        user_dal = UserDAL()
+        checked = corrected = 0
+        last_id = 0
+        with Session() as db_session:
+            while True:
+                ids = db_session.scalars(
+                    select(User.id).where(User.id > last_id).order_by(User.id).limit(batch_size)
+                ).all()
+                if not ids:
+                    break
+                corrected += len(user_dal.reconcile_posts_counts(ids, db_session))
+                checked += len(ids)
+                last_id = ids[-1]
+                self.stdout.write(f"{checked} users checked, {corrected} corrected")
+
+        if corrected:
+            bump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)  # Cached pages carry the old counts
+        self.stdout.write(self.style.SUCCESS(f"Post counts reconciled ({corrected} of {checked} users corrected)."))
@@ -0,0 +1,133 @@
+"""
+Prometheus metrics, served in the text exposition format at /metrics.
+
+Counters and histograms are plain prometheus_client objects updated in-process
+(a lock and an add per observation). With several workers, set
+PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py does) before the app is imported:
+every worker then writes its values to memory-mapped files in that directory
+and /metrics sums them across workers, so any worker can answer a scrape.
+
+    http_request_duration_seconds{view,method,status}   request latency per endpoint
+    db_pool_checkout_seconds{engine}                     wait for a pooled connection
+    db_pool_connections_in_use / _overflow / _size       pool occupancy, summed over live workers
+    cache_lookups_total{prefix,result}                   l1_hit / l2_hit / miss per key family
+    redis_command_duration_seconds{operation}            Redis round trips (L2 reads, writes)
+
+Set PROMETHEUS_METRICS=false to stop recording (/metrics then stays empty).
+"""
+import os
+import re
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+ENABLED = getattr(settings, "PROMETHEUS_METRICS", True)
+
+# Sub-millisecond buckets: pool checkouts and Redis round trips are usually far below the defaults
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency per endpoint.", ["view", "method", "status"],
+)
+POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a pooled database connection.", ["engine"],
+    buckets=FAST_BUCKETS,
+)
+POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use", "Connections checked out of the pool.", ["engine"], multiprocess_mode="livesum",
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond pool_size.", ["engine"], multiprocess_mode="livesum",
+)
+POOL_SIZE = Gauge(
+    "db_pool_size", "Configured pool_size.", ["engine"], multiprocess_mode="livesum",
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Cache lookups by key family and outcome (l1_hit, l2_hit, miss).", ["prefix", "result"],
+)
+REDIS_LATENCY = Histogram(
+    "redis_command_duration_seconds", "Redis round-trip time.", ["operation"], buckets=FAST_BUCKETS,
+)
+
+_GENERATION = re.compile(r"^\d+$")
+
+
+def key_family(key: str) -> str:
+    """
+    Low-cardinality label for a cache key: `posts:12:page_1_per_page_10` -> `posts:page`,
+    `users:3:cursor_...` -> `users:cursor`, `generation:posts` -> `generation`.
+    """
+    parts = key.split(":", 2)
+    if len(parts) == 3 and _GENERATION.match(parts[1]):
+        return f"{parts[0]}:{parts[2].split('_', 1)[0]}"
+    return parts[0]
+
+
+def observe_request(request, response, seconds: float):
+    if not ENABLED:
+        return
+    match = getattr(request, "resolver_match", None)
+    view = match.view_name if match is not None else "unmatched"
+    REQUEST_LATENCY.labels(view, request.method, response.status_code).observe(seconds)
+
+
+def observe_cache_lookup(key: str, result: str, redis_seconds: float = None):
+    """Count a lookup; `redis_seconds` is the L2 round trip, None when L1 answered."""
+    if not ENABLED:
+        return
+    CACHE_LOOKUPS.labels(key_family(key), result).inc()
+    if redis_seconds is not None:
+        REDIS_LATENCY.labels("get").observe(redis_seconds)
+
+
+def observe_redis_write(seconds: float):
+    if ENABLED:
+        REDIS_LATENCY.labels("write").observe(seconds)
+
+
+class _TimedCheckoutMixin:
+    """
+    Times every checkout (including opening a new connection) and publishes the pool's
+    occupancy. The `engine` label is the pool's logging name (`pool_logging_name`).
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        connection = super()._do_get()
+        if ENABLED:
+            engine = getattr(self, "logging_name", None) or "default"
+            POOL_CHECKOUT.labels(engine).observe(time.perf_counter() - started)
+            self._publish_occupancy(engine)
+        return connection
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        if ENABLED:
+            self._publish_occupancy(getattr(self, "logging_name", None) or "default")
+
+    def _publish_occupancy(self, engine: str):
+        POOL_IN_USE.labels(engine).set(self.checkedout())
+        POOL_OVERFLOW.labels(engine).set(max(self.overflow(), 0))
+        POOL_SIZE.labels(engine).set(self.size())
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool reporting checkout wait and occupancy to Prometheus."""
+
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool (asyncpg engines) reporting checkout wait and occupancy to Prometheus."""
+
+
+def metrics_view(request):
+    """Every metric in the Prometheus text format, summed over all workers in multiprocess mode."""
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
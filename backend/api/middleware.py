@@ -0,0 +1,154 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from django.conf import settings
+
+from .db import bind_request_session, unbind_request_session
+from .instrumentation import logger as request_logger, start_request_metrics, stop_request_metrics
+from .metrics import observe_request
+from .models import Session, replica_configured
+
+
+class RequestMetricsMiddleware:
+    """
+    Counts SQL statements, cache operations and serialization time per request
+    (see api/instrumentation.py), then reports them in a `Server-Timing` header
+    (unless SERVER_TIMING is off) and one "api.requests" log record, and feeds the
+    per-endpoint latency histogram in api/metrics.py.
+    Listed first in MIDDLEWARE so `total` covers the whole stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.send_header = getattr(settings, "SERVER_TIMING", True)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics, token = start_request_metrics()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_request_metrics(token)
+        return self._report(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics, token = start_request_metrics()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_request_metrics(token)
+        return self._report(request, response, metrics)
+
+    def _report(self, request, response, metrics):
+        observe_request(request, response, metrics.elapsed())
+        if self.send_header:
+            response["Server-Timing"] = metrics.server_timing()
+        if request_logger.isEnabledFor(logging.INFO):
+            values = metrics.as_dict()
+            request_logger.info(
+                "%s %s %s %s", request.method, request.path, response.status_code,
+                " ".join(f"{name}={value}" for name, value in values.items()),
+                extra={"method": request.method, "path": request.path, "status": response.status_code, **values},
+            )
+        return response
+
+
+# Safe methods read from the replica unless the client wrote within REPLICA_STICKY_SECONDS
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+STICKY_COOKIE = "primary_until"
+
+
+class SQLAlchemySessionMiddleware:
+    """
+    Opens one SQLAlchemy session per request and exposes it as `request.db_session`.
+    The session is committed when the response is successful, rolled back on
+    errors, and always closed so its pooled connection goes back to the pool.
+
+    With a read replica configured, sessions of safe requests read from it. A
+    successful write sets a `primary_until` cookie so the same client keeps
+    reading from the primary, and sees its own writes, until replication caught up.
+
+    The middleware is async-capable so that async views served over ASGI are not
+    forced through a thread; the (blocking) commit only hops to a thread when the
+    request actually opened a transaction.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, "REPLICA_STICKY_SECONDS", 5) if replica_configured() else None
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        session = self._open(request)
+        token = bind_request_session(session)
+        try:
+            response = self.get_response(request)
+        except Exception:
+            self._finish(session, success=False)
+            raise
+        finally:
+            unbind_request_session(token)
+        self._finish(session, success=response.status_code < 400)
+        return self._stick(request, response)
+
+    async def __acall__(self, request):
+        session = self._open(request)
+        token = bind_request_session(session)
+        try:
+            response = await self.get_response(request)
+        except Exception:
+            await self._afinish(session, success=False)
+            raise
+        finally:
+            unbind_request_session(token)
+        await self._afinish(session, success=response.status_code < 400)
+        return self._stick(request, response)
+
+    def _open(self, request):
+        session = Session(replica=self.sticky_seconds is not None and self._reads_from_replica(request))
+        request.db_session = session
+        return session
+
+    def _reads_from_replica(self, request) -> bool:
+        if request.method not in SAFE_METHODS:
+            return False
+        try:
+            return float(request.COOKIES.get(STICKY_COOKIE, 0)) < time.time()
+        except ValueError:
+            return True
+
+    def _stick(self, request, response):
+        """After a successful write, keep this client on the primary for REPLICA_STICKY_SECONDS."""
+        if self.sticky_seconds is not None and request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                STICKY_COOKIE, str(int(time.time()) + self.sticky_seconds + 1),
+                max_age=self.sticky_seconds + 1, httponly=True, samesite="Lax",
+            )
+        return response
+
+    def _finish(self, session, success: bool):
+        try:
+            if success:
+                session.commit()
+            else:
+                session.rollback()
+        finally:
+            session.close()
+
+    async def _afinish(self, session, success: bool):
+        if session.in_transaction():
+            await sync_to_async(self._finish)(session, success)
+        else:
+            session.close()
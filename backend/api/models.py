@@ -1,20 +1,186 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import create_engine, event, Column, Integer, String, DateTime, ForeignKey, Index, func, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import declarative_base  # Using declarative base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import Session as BaseSession, deferred, query_expression, sessionmaker, relationship
 from django.conf import settings
+from .metrics import TimedQueuePool
+from contextlib import contextmanager
+from contextvars import ContextVar
+import os
+import threading
+import time
 
 # Define the base class for SQLAlchemy models
 Base = declarative_base()
 
-# Fetch database configuration from Django settings
-db_config = settings.DATABASES['default']
-url = f"postgresql://{db_config['USER']}:{db_config['PASSWORD']}@{db_config['HOST']}:{db_config['PORT']}/{db_config['NAME']}"
 
-# Create database engine
-engine = create_engine(url)
+def database_url(config: dict) -> str:
+    """SQLAlchemy URL for a Django DATABASES entry."""
+    return f"postgresql://{config['USER']}:{config['PASSWORD']}@{config['HOST']}:{config['PORT']}/{config['NAME']}"
+
 
-# Create session factory bound to the engine
-Session = sessionmaker(bind=engine)
+# Fetch database configuration from Django settings
+db_config = settings.DATABASES['default']
+url = database_url(db_config)
+
+# Optional read replica (DATABASES['replica']); None sends every query to the primary
+replica_url = database_url(settings.DATABASES['replica']) if 'replica' in settings.DATABASES else None
+
+# The engine is created on first use, not at import: importing the app (worker
+# boot, manage.py, test collection) never loads the driver or opens a connection.
+_engine = None
+_engine_pid = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """
+    Return the process-wide engine, creating it on first use; pool sizing comes from Django settings.
+    In a forked child (gunicorn --preload, multiprocessing) the pool inherited from the
+    parent is dropped without closing its connections, which still belong to the parent.
+    """
+    global _engine, _engine_pid
+    if _engine is None or _engine_pid != os.getpid():
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(
+                    url, poolclass=TimedQueuePool, pool_logging_name='primary',
+                    **getattr(settings, 'SQLALCHEMY_ENGINE_OPTIONS', {}),
+                )
+            elif _engine_pid != os.getpid():
+                _engine.dispose(close=False)
+            _engine_pid = os.getpid()
+    return _engine
+
+
+_replica_engine = None
+_replica_engine_pid = None
+_replica_checked_at = 0.0  # time.monotonic() of the last successful replica checkout
+_replica_down_until = 0.0  # Reads stay on the primary until then after the replica failed
+
+# Seconds reads skip the replica after it failed, and between health checks while it is up
+REPLICA_RETRY_SECONDS = getattr(settings, 'REPLICA_RETRY_SECONDS', 30)
+REPLICA_CHECK_SECONDS = getattr(settings, 'REPLICA_CHECK_SECONDS', 5)
+
+
+def replica_configured() -> bool:
+    return replica_url is not None
+
+
+def get_replica_engine():
+    """Return the read replica's engine (same lifecycle as `get_engine`), or None without a replica."""
+    global _replica_engine, _replica_engine_pid
+    if replica_url is None:
+        return None
+    if _replica_engine is None or _replica_engine_pid != os.getpid():
+        with _engine_lock:
+            if _replica_engine is None:
+                _replica_engine = create_engine(
+                    replica_url, poolclass=TimedQueuePool, pool_logging_name='replica',
+                    **getattr(settings, 'SQLALCHEMY_ENGINE_OPTIONS', {}),
+                )
+                event.listen(_replica_engine, 'handle_error', _replica_failed)
+            elif _replica_engine_pid != os.getpid():
+                _replica_engine.dispose(close=False)
+            _replica_engine_pid = os.getpid()
+    return _replica_engine
+
+
+def _replica_failed(context):
+    """Lost or refused replica connections send reads back to the primary for REPLICA_RETRY_SECONDS."""
+    if context.is_disconnect or context.connection is None:
+        _mark_replica_down()
+
+
+def _mark_replica_down():
+    global _replica_down_until, _replica_checked_at
+    _replica_down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+    _replica_checked_at = 0.0
+
+
+def get_read_engine():
+    """
+    The engine to read from: the replica while it is reachable, otherwise the primary.
+    Every REPLICA_CHECK_SECONDS a connection is checked out (and pinged) first, so a replica
+    that went away is noticed before a request's query fails on it.
+    """
+    global _replica_checked_at
+    replica = get_replica_engine()
+    if replica is None or _primary_reads.get():
+        return get_engine()
+    now = time.monotonic()
+    if now < _replica_down_until:
+        return get_engine()
+    if now - _replica_checked_at > REPLICA_CHECK_SECONDS:
+        try:
+            replica.connect().close()
+        except DBAPIError:
+            _mark_replica_down()
+            return get_engine()
+        _replica_checked_at = now
+    return replica
+
+
+# Set while reads must see the primary's latest writes (see `primary_reads`)
+_primary_reads: ContextVar = ContextVar("primary_reads", default=False)
+
+
+@contextmanager
+def primary_reads(enabled: bool = True):
+    """Send the reads made in the block to the primary, e.g. right after a write."""
+    token = _primary_reads.set(enabled or _primary_reads.get())
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
+def _is_read(clause) -> bool:
+    """Plain SELECTs only: not writes, raw SQL or SELECT ... FOR UPDATE."""
+    return getattr(clause, 'is_select', False) and getattr(clause, '_for_update_arg', None) is None
+
+
+class LazySession(BaseSession):
+    """
+    Session that resolves the engine when it first executes instead of when it is created.
+
+    A `replica=True` session (safe HTTP methods, DAL getters) runs its SELECTs on the
+    read replica when one is configured and reachable. Anything else (flushes, DML, raw
+    SQL, locking reads) goes to the primary and pins the session there, so it reads its
+    own writes afterwards.
+    """
+
+    def __init__(self, *args, replica: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.bind is not None:
+            return super().get_bind(mapper, clause, **kw)
+        if self.replica:
+            if _is_read(clause) and not self._flushing:
+                return get_read_engine()
+            self.replica = False
+        return get_engine()
+
+
+# Session factory; sessions bind to get_engine() lazily
+Session = sessionmaker(class_=LazySession)
+
+# Text search configuration used for posts.search_vector and search queries
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+
+def search_document(title, content):
+    """
+    SQL expression building a post's tsvector from its title and content.
+    Accepts plain values (INSERT) or columns (UPDATE ... SET).
+    """
+    # Weights are inlined: asyncpg would bind them as varchar, which setweight() does not accept
+    return func.setweight(func.to_tsvector(SEARCH_CONFIG, func.coalesce(title, '')), literal_column("'A'")).op('||')(
+        func.setweight(func.to_tsvector(SEARCH_CONFIG, func.coalesce(content, '')), literal_column("'B'"))
+    )
 
 
 class User(Base):
@@ -26,10 +192,18 @@ class User(Base):
     email = Column(String, unique=True, nullable=False)  # Unique email
     password = Column(String, nullable=False)  # Hashed password (should be stored securely)
     created_at = Column(DateTime, default=func.now())  # Timestamp for account creation
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())  # Row version for HTTP validators
+
+    # Number of posts by this user, kept in step by PostDAL/AsyncPostDAL in the same transaction
+    # as the post writes; `manage.py reconcile_posts_counts` repairs rows written around them
+    posts_count = Column(Integer, nullable=False, default=0, server_default='0')
 
     # Relationship with posts (One-to-Many)
     posts = relationship("Post", back_populates="author", cascade='all, delete-orphan')
 
+    # Composite index backing keyset (cursor) pagination on (created_at, id)
+    __table_args__ = (Index('ix_users_created_at_id', 'created_at', 'id'),)
+
     def __repr__(self):
         """String representation of the User object."""
         return f"<User(username='{self.username}', email='{self.email}')>"
@@ -43,15 +217,36 @@ class Post(Base):
     title = Column(String, nullable=False)  # Post title
     content = Column(String, nullable=False)  # Post content
     created_at = Column(DateTime, default=func.now())  # Timestamp for post creation
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())  # Row version for HTTP validators
 
     # Foreign key linking the post to the author (User)
     author_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     author = relationship("User", back_populates="posts")  # Relationship with User
 
+    # Full-text search document (title weighted above content), maintained by PostDAL.
+    # Only ever used in SQL, so ORM loads leave it out.
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+    # Leading characters of content, filled by list queries with `with_expression` (see PostDAL)
+    excerpt = query_expression()
+
+    # Ticket of a post accepted by the write-behind queue (api/post_queue.py); NULL otherwise
+    idempotency_key = Column(String, nullable=True)
+
+    __table_args__ = (
+        # Composite index backing keyset (cursor) pagination on (created_at, id)
+        Index('ix_posts_created_at_id', 'created_at', 'id'),
+        # Same order within one author: ?author_id= lists and /users/{id}/posts/
+        Index('ix_posts_author_id_created_at_id', 'author_id', 'created_at', 'id'),
+        # GIN index for full-text search
+        Index('ix_posts_search_vector', 'search_vector', postgresql_using='gin'),
+        # Redelivered queue entries must not insert a second copy of the post
+        Index(
+            'ix_posts_idempotency_key', 'idempotency_key', unique=True,
+            postgresql_where=idempotency_key.isnot(None),
+        ),
+    )
+
     def __repr__(self):
         """String representation of the Post object."""
         return f"<Post(title='{self.title}', author_id='{self.author_id}')>"
-
-
-# Create tables in the database if they don't exist
-Base.metadata.create_all(engine)
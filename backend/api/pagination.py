@@ -0,0 +1,238 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from rest_framework.utils.urls import replace_query_param
+
+from .cache import splice_results
+
+DEFAULT_PER_PAGE = 10
+MAX_PER_PAGE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor that cannot be decoded."""
+
+
+def _encode_payload(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_payload(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, json.JSONDecodeError, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor("Invalid cursor.") from e
+    if not isinstance(payload, dict):
+        raise InvalidCursor("Invalid cursor.")
+    return payload
+
+
+def encode_cursor(direction: str, created_at: datetime, obj_id: int) -> str:
+    """
+    Encode a keyset position as an opaque, URL-safe cursor.
+    The direction tells the next request whether to read older ("n") or newer ("p") rows.
+    """
+    return _encode_payload({"d": direction, "c": created_at.isoformat(), "i": obj_id})
+
+
+def decode_cursor(cursor: str):
+    """Decode a cursor into (direction, created_at, id)."""
+    payload = _decode_payload(cursor)
+    try:
+        direction = payload["d"]
+        if direction not in ("n", "p"):
+            raise InvalidCursor("Invalid cursor.")
+        return direction, datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise InvalidCursor("Invalid cursor.") from e
+
+
+def encode_rank_cursor(rank: float, obj_id: int) -> str:
+    """Encode a (rank, id) search position as an opaque cursor."""
+    return _encode_payload({"r": rank, "i": obj_id})
+
+
+def decode_rank_cursor(cursor: str):
+    """Decode a search cursor into (rank, id)."""
+    payload = _decode_payload(cursor)
+    try:
+        return float(payload["r"]), int(payload["i"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise InvalidCursor("Invalid cursor.") from e
+
+
+def _query_params(request):
+    """Query string of a DRF request or a plain Django HttpRequest."""
+    return getattr(request, "query_params", request.GET)
+
+
+def parse_per_page(request, default=DEFAULT_PER_PAGE, maximum=MAX_PER_PAGE) -> int:
+    """Read `per_page` from the query string, clamped to [1, maximum]."""
+    try:
+        per_page = int(_query_params(request).get("per_page", default))
+    except (TypeError, ValueError):
+        raise ValueError("per_page must be an integer.")
+    return max(1, min(per_page, maximum))
+
+
+def parse_page(request) -> int:
+    """Read a 1-based `page` number from the query string."""
+    try:
+        page = int(_query_params(request).get("page", 1))
+    except (TypeError, ValueError):
+        raise ValueError("page must be an integer.")
+    if page < 1:
+        raise ValueError("page must be greater than or equal to 1.")
+    return page
+
+
+class PageNumberPaginator:
+    """
+    Bounded page/per_page pagination.
+
+    `fetch` is a DAL callable taking (page, per_page) and returning up to
+    per_page + 1 rows; the extra row only signals that a next page exists.
+    """
+
+    page_param = "page"
+
+    def __init__(self, request, per_page: int):
+        self.request = request
+        self.page = parse_page(request)
+        self.per_page = per_page
+        self.has_next = False
+
+    def fetch_args(self):
+        """Arguments for the DAL fetch callable: (page, per_page)."""
+        return self.page, self.per_page
+
+    def paginate(self, fetch):
+        """Fetch one page of rows."""
+        return self.paginate_rows(fetch(*self.fetch_args()))
+
+    def paginate_rows(self, rows):
+        """Trim rows returned for `fetch_args()` to one page."""
+        self.has_next = len(rows) > self.per_page
+        return rows[:self.per_page]
+
+    def _link(self, page):
+        url = replace_query_param(self.request.build_absolute_uri(), "per_page", self.per_page)
+        return replace_query_param(url, self.page_param, page)
+
+    def get_response_data(self, results):
+        """Wrap serialized rows in the page response envelope."""
+        return {
+            "page": self.page,
+            "per_page": self.per_page,
+            "next": self._link(self.page + 1) if self.has_next else None,
+            "previous": self._link(self.page - 1) if self.page > 1 else None,
+            "results": results,
+        }
+
+    def render_response(self, results_json: bytes) -> bytes:
+        """Render the envelope around pre-rendered `results` JSON."""
+        envelope = self.get_response_data(None)
+        del envelope["results"]
+        return splice_results(envelope, results_json)
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over (created_at, id), newest first.
+
+    `fetch` is a DAL callable taking (limit, after, before) and returning rows
+    ordered by (created_at, id) descending. One extra row is requested to find
+    out whether another page exists, so no COUNT query is needed.
+    """
+
+    cursor_param = "cursor"
+
+    def __init__(self, request, per_page: int):
+        self.request = request
+        self.per_page = per_page
+        cursor = _query_params(request).get(self.cursor_param)
+        self.position = decode_cursor(cursor) if cursor else None
+
+    def fetch_args(self):
+        """Arguments for the DAL fetch callable: (limit, after, before)."""
+        limit = self.per_page + 1
+        if self.position is None:
+            return limit, None, None
+        direction, created_at, obj_id = self.position
+        if direction == "n":
+            return limit, (created_at, obj_id), None
+        return limit, None, (created_at, obj_id)
+
+    def paginate(self, fetch):
+        """Fetch one page of rows and compute the cursors around it."""
+        return self.paginate_rows(fetch(*self.fetch_args()))
+
+    def paginate_rows(self, rows):
+        """Trim rows returned for `fetch_args()` to one page and compute the cursors around it."""
+        if self.position is None:
+            has_next, has_previous = len(rows) > self.per_page, False
+            rows = rows[:self.per_page]
+        elif self.position[0] == "n":
+            has_next, has_previous = len(rows) > self.per_page, True
+            rows = rows[:self.per_page]
+        else:
+            has_next, has_previous = True, len(rows) > self.per_page
+            rows = rows[-self.per_page:]
+
+        self.next_cursor = encode_cursor("n", rows[-1].created_at, rows[-1].id) if rows and has_next else None
+        self.previous_cursor = encode_cursor("p", rows[0].created_at, rows[0].id) if rows and has_previous else None
+        return rows
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_param, cursor)
+
+    def get_response_data(self, results):
+        """Wrap serialized rows in the cursor response envelope."""
+        return {
+            "next": self._link(self.next_cursor),
+            "previous": self._link(self.previous_cursor),
+            "results": results,
+        }
+
+    def render_response(self, results_json: bytes) -> bytes:
+        """Render the envelope around pre-rendered `results` JSON."""
+        envelope = self.get_response_data(None)
+        del envelope["results"]
+        return splice_results(envelope, results_json)
+
+
+class RankPaginator:
+    """
+    Forward-only keyset pagination over (rank, id), best match first, for search results.
+    `fetch` takes (limit, after) where `after` is the (rank, id) of the last row already seen.
+    """
+
+    cursor_param = "cursor"
+
+    def __init__(self, request, per_page: int):
+        self.request = request
+        self.per_page = per_page
+        cursor = _query_params(request).get(self.cursor_param)
+        self.position = decode_rank_cursor(cursor) if cursor else None
+        self.next_cursor = None
+
+    def paginate(self, fetch):
+        """Fetch one page of rows and compute the cursor to the next one."""
+        rows = fetch(self.per_page + 1, self.position)
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        self.next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].id) if rows and has_next else None
+        return rows
+
+    def get_response_data(self, results):
+        """Wrap serialized rows in the search response envelope."""
+        next_link = None
+        if self.next_cursor is not None:
+            next_link = replace_query_param(self.request.build_absolute_uri(), self.cursor_param, self.next_cursor)
+        return {"next": next_link, "results": results}
@@ -0,0 +1,163 @@
+"""
+Write-behind queue for post creation, on a Redis Stream.
+
+With POST_WRITE_BEHIND on (or a `Prefer: respond-async` request header),
+PostViewSet.create validates the post, appends it to the stream and answers
+202 with a ticket instead of inserting it. `python manage.py drain_post_queue`
+reads the stream through a consumer group in batches, inserts every batch with
+one PostDAL.bulk_create_posts_once call and bumps the posts cache generation
+once per batch.
+
+Delivery is at-least-once: entries are acknowledged only after their batch is
+committed, and entries left pending by a crashed worker are claimed again after
+CLAIM_IDLE_MS. The ticket is stored as posts.idempotency_key (unique), so an
+entry delivered twice still creates one post.
+
+Ticket status lives in Redis next to the stream (`post_queue:ticket:<ticket>`):
+{"status": "pending"}, then {"status": "created", "id": ...} or
+{"status": "failed", "errors": {...}}. Entries without a readable ticket cannot
+report anywhere, so they are copied to DEAD_LETTER_STREAM and acknowledged
+rather than being claimed again forever.
+"""
+import json
+import logging
+import os
+import threading
+import uuid
+
+import redis
+from django.conf import settings
+
+from .cache import POSTS_NAMESPACE, USERS_NAMESPACE, bump_generation
+from .dal import PostDAL, UserDAL
+from .models import Session
+from .serializers import PostSerializer
+
+logger = logging.getLogger(__name__)
+
+# A database of its own by default: the cache's FLUSHDB (cache.clear()) must not drop queued posts
+REDIS_URL = getattr(settings, "POST_QUEUE_REDIS_URL", "redis://127.0.0.1:6379/2")
+STREAM = "post_queue:stream"
+DEAD_LETTER_STREAM = "post_queue:dead"
+TICKET_PREFIX = "post_queue:ticket:"
+GROUP = "post-writers"
+TICKET_TTL = 24 * 3600  # Seconds a ticket's status stays readable
+CLAIM_IDLE_MS = 60_000  # Pending entries idle this long belong to a dead worker and are claimed again
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> redis.Redis:
+    """Process-wide Redis client for the queue; a forked child opens its own connections."""
+    global _client, _client_pid
+    if _client is None or _client_pid != os.getpid():
+        with _client_lock:
+            if _client is None or _client_pid != os.getpid():
+                _client = redis.Redis.from_url(REDIS_URL)
+                _client_pid = os.getpid()
+    return _client
+
+
+def _ticket_key(ticket: str) -> str:
+    return f"{TICKET_PREFIX}{ticket}"
+
+
+def new_ticket() -> str:
+    return uuid.uuid4().hex
+
+
+def enqueue_post(post_data: dict) -> str:
+    """Append validated post data (title, content, author_id) to the stream; returns its ticket."""
+    ticket = new_ticket()
+    pipeline = get_client().pipeline()
+    pipeline.set(_ticket_key(ticket), json.dumps({"status": "pending"}), ex=TICKET_TTL)
+    pipeline.xadd(STREAM, {"ticket": ticket, "post": json.dumps(post_data)})
+    pipeline.execute()
+    return ticket
+
+
+def get_ticket(ticket: str):
+    """Status of a ticket, or None when it is unknown or expired."""
+    raw = get_client().get(_ticket_key(ticket))
+    return json.loads(raw) if raw is not None else None
+
+
+def ensure_group(client: redis.Redis):
+    """Create the stream and its consumer group if they do not exist yet."""
+    try:
+        client.xgroup_create(STREAM, GROUP, id="0", mkstream=True)
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def read_batch(client: redis.Redis, consumer: str, count: int, block_ms: int = None):
+    """
+    Up to `count` entries for `consumer`: first entries other workers left pending for
+    longer than CLAIM_IDLE_MS, then new ones (waiting up to `block_ms` for them).
+    """
+    entries = client.xautoclaim(STREAM, GROUP, consumer, CLAIM_IDLE_MS, "0-0", count=count)[1]
+    if entries:
+        return entries
+    response = client.xreadgroup(GROUP, consumer, {STREAM: ">"}, count=count, block=block_ms)
+    return response[0][1] if response else []
+
+
+def process_batch(client: redis.Redis, entries, post_dal: PostDAL = None, user_dal: UserDAL = None) -> dict:
+    """
+    Insert one batch of stream entries and acknowledge them.
+    Malformed entries fail their ticket, or go to DEAD_LETTER_STREAM when they have no
+    readable ticket; post data is validated again with PostSerializer, so an entry with
+    wrong types or nulls fails its own ticket instead of the batch's INSERT; posts whose
+    author does not exist fail their ticket; the rest are inserted in one transaction. If that transaction fails nothing is acknowledged, so
+    the whole batch is delivered again. Returns counts of created and failed posts.
+    """
+    post_dal = post_dal or PostDAL()
+    user_dal = user_dal or UserDAL()
+    rows, statuses, dead = [], {}, []
+    for entry_id, fields in entries:
+        ticket = None
+        try:
+            ticket = fields[b"ticket"].decode()
+            post = json.loads(fields[b"post"])
+        except (KeyError, ValueError) as e:  # UnicodeDecodeError and JSONDecodeError are ValueErrors
+            if ticket is None:
+                logger.warning("Dead-lettering queue entry %s without a readable ticket: %r", entry_id, e)
+                dead.append(fields)
+            else:
+                statuses[ticket] = {"status": "failed", "errors": {"post": ["Malformed queue entry."]}}
+            continue
+        # The entry was validated when queued, but the stream accepts anything: check it again
+        serializer = PostSerializer(data=post, context={'check_author': False})
+        if not serializer.is_valid():
+            statuses[ticket] = {"status": "failed", "errors": serializer.errors}
+            continue
+        rows.append(dict(serializer.validated_data, idempotency_key=ticket))
+
+    with Session() as db_session:
+        existing_authors = user_dal.get_existing_user_ids((row["author_id"] for row in rows), db_session)
+        insertable = []
+        for row in rows:
+            if row["author_id"] in existing_authors:
+                insertable.append(row)
+            else:
+                statuses[row["idempotency_key"]] = {"status": "failed", "errors": {"author_id": ["Author does not exist."]}}
+        ids = post_dal.bulk_create_posts_once(insertable, db_session)
+    for ticket, post_id in ids.items():
+        statuses[ticket] = {"status": "created", "id": post_id}
+    if ids:
+        bump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)  # Invalidate once for the whole batch
+
+    entry_ids = [entry_id for entry_id, _ in entries]
+    pipeline = client.pipeline()
+    for fields in dead:
+        pipeline.xadd(DEAD_LETTER_STREAM, fields)
+    for ticket, status in statuses.items():
+        pipeline.set(_ticket_key(ticket), json.dumps(status), ex=TICKET_TTL)
+    pipeline.xack(STREAM, GROUP, *entry_ids)
+    pipeline.xdel(STREAM, *entry_ids)  # Acknowledged entries are not needed again; keeps the stream short
+    pipeline.execute()
+    created = sum(1 for status in statuses.values() if status["status"] == "created")
+    return {"created": created, "failed": len(statuses) - created + len(dead)}
@@ -0,0 +1,39 @@
+"""
+Process hooks for pre-forking servers (gunicorn --preload, see gunicorn.conf.py).
+
+The master imports the app once and forks workers that share its memory
+copy-on-write. Sockets must not cross the fork: each worker starts with an
+empty SQLAlchemy pool and its own Redis connections, while the parent's
+connections stay open for the parent.
+"""
+import gc
+
+from django.core.cache import caches
+from django.urls import get_resolver
+
+from .models import get_engine, get_replica_engine
+
+
+def warm_up():
+    """Import the URL patterns (and with them every view, serializer and DAL) and the DB driver."""
+    get_resolver().url_patterns
+    get_engine()  # Builds the engine and loads psycopg2; no connection is opened
+
+
+def freeze():
+    """
+    Move every object allocated so far to the permanent GC generation.
+    Collections in the workers then never touch (and copy) the pages shared with the master.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def reset_after_fork():
+    """Give a freshly forked worker its own connection pools."""
+    get_engine()  # Disposes the pool inherited from the parent without closing its connections
+    get_replica_engine()
+    for cache in caches.all(initialized_only=True):
+        reset = getattr(cache, "reset_connections", None)
+        if reset is not None:
+            reset()
@@ -1,13 +1,22 @@
 from rest_framework import serializers
-from .models import User, Post, sessionmaker, engine
-from sqlalchemy.orm import Session, joinedload
+from .models import User, Post
+from .db import session_scope
+from .instrumentation import measure_serialization
 import logging
 
 # Configure logger for debugging
 logger = logging.getLogger(__name__)
 
 
-class UserSerializer(serializers.Serializer):
+class MeasuredSerializer(serializers.Serializer):
+    """Base serializer whose output time is reported as `serialize` in Server-Timing."""
+
+    def to_representation(self, instance):
+        with measure_serialization():
+            return super().to_representation(instance)
+
+
+class UserSerializer(MeasuredSerializer):
     """
     Serializer for the User model.
     Handles serialization and deserialization of User objects.
@@ -17,6 +26,7 @@ class UserSerializer(serializers.Serializer):
     email = serializers.EmailField()  # Required email (must be unique)
     password = serializers.CharField(write_only=True)  # Write-only for security
     created_at = serializers.DateTimeField(read_only=True)  # Read-only timestamp
+    posts_count = serializers.IntegerField(read_only=True)  # Denormalized, maintained by PostDAL
 
     def create(self, validated_data):
         """
@@ -35,7 +45,7 @@ class UserSerializer(serializers.Serializer):
         return instance
 
 
-class PostSerializer(serializers.Serializer):
+class PostSerializer(MeasuredSerializer):
     """
     Serializer for the Post model.
     Handles serialization and deserialization of Post objects.
@@ -47,7 +57,31 @@ class PostSerializer(serializers.Serializer):
 
     # SerializerMethodField allows us to customize how a field is retrieved
     author = serializers.SerializerMethodField()
-    author_id = serializers.IntegerField(write_only=True)  # Only required on input
+    # Only required on input; bounded to the posts.author_id column (int4)
+    author_id = serializers.IntegerField(write_only=True, min_value=1, max_value=2**31 - 1)
+
+    # Rendered only when a fieldset asks for them
+    OUTPUT_ONLY_FIELDS = {
+        'excerpt': lambda: serializers.CharField(read_only=True),  # Filled by list queries (see PostDAL)
+        'author_id': lambda: serializers.IntegerField(read_only=True),
+    }
+
+    def __init__(self, *args, fields=None, **kwargs):
+        """
+        `fields` (see filters.POST_FIELDS) limits the output to those fields, in that order,
+        e.g. for `?fields=id,title`; `author_id` is then rendered as a plain integer.
+        """
+        self.output_fields = fields
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.output_fields is None:
+            return fields
+        return {
+            name: self.OUTPUT_ONLY_FIELDS[name]() if name in self.OUTPUT_ONLY_FIELDS else fields[name]
+            for name in self.output_fields
+        }
 
     def get_author(self, obj):
         """
@@ -79,16 +113,26 @@ class PostSerializer(serializers.Serializer):
         Custom validation for author_id.
         Ensures that the provided author_id corresponds to an existing User in the database.
         """
+        if not self.context.get('check_author', True):
+            return value  # Caller checks the author itself (e.g. on an async session)
         logger.debug(f"Validating author_id: {value}")
-        Session = sessionmaker(bind=engine)
-        db_session = Session()
-
-        try:
+        with session_scope() as db_session:
             author = db_session.query(User).filter(User.id == value).first()
             if author is None:
                 logger.warning(f"Author with id {value} does not exist.")
                 raise serializers.ValidationError("Author does not exist.")
             logger.debug(f"Author with id {value} found.")
             return value
-        finally:
-            db_session.close()
+
+
+class PostSearchResultSerializer(MeasuredSerializer):
+    """
+    Read-only serializer for full-text search hits.
+    `snippet` is an HTML-escaped excerpt of the content with matches wrapped in <mark> tags.
+    """
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    created_at = serializers.DateTimeField()
+    author_id = serializers.IntegerField()
+    rank = serializers.FloatField()
+    snippet = serializers.CharField()
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import UserViewSet, PostViewSet, CachedUserViewSet
+from .metrics import metrics_view
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
 # Define API v1 router and register viewsets
@@ -10,9 +11,18 @@ router_v1.register(r'posts', PostViewSet, basename='post')  # Post endpoints
 router_v1.register(r'cached_users', CachedUserViewSet, basename='cached-user')  # Cached user endpoints
 
 urlpatterns = [
+    # A user's posts: the posts list with the author taken from the URL
+    path('api/v1/users/<int:user_id>/posts/', PostViewSet.as_view({'get': 'list'}), name='user-posts'),
+
     # Include API v1 routes
     path('api/v1/', include(router_v1.urls)),
 
+    # Async (ASGI) variants of the user and post endpoints
+    path('api/v1/async/', include('api.views_async')),
+
+    # Prometheus scrape endpoint
+    path('metrics', metrics_view, name='metrics'),
+
     # API Schema and Documentation
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
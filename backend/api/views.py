@@ -1,15 +1,85 @@
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import User, Post, sessionmaker, engine
-from .serializers import UserSerializer, PostSerializer
-from .dal import UserDAL, PostDAL
+from .models import User
+from .serializers import UserSerializer, PostSerializer, PostSearchResultSerializer
+from .dal import UserDAL, PostDAL, USER_EXPORT_COLUMNS, POST_EXPORT_COLUMNS
+from .export import EXPORT_FORMATS, streaming_export
+from .filters import (
+    POST_EXCERPT_LENGTH, POST_LIST_FIELDS, parse_datetime_param, parse_excerpt_length, parse_post_fields,
+    parse_post_filters, parse_post_list_fields,
+)
+from .cache import (
+    POSTS_NAMESPACE, USERS_NAMESPACE, bump_generation, get_or_compute, json_response, namespaced_key,
+)
+from .fastjson import post_row_mapper, render_rows, user_row
+from .conditional import add_validators, conditional_list, not_modified, row_validators
+from .pagination import KeysetPaginator, PageNumberPaginator, RankPaginator, InvalidCursor, parse_per_page
+from . import post_queue
 import logging
-from sqlalchemy.orm import joinedload
-from django.core.cache import cache
 
 # Configure logger for debugging
 logger = logging.getLogger(__name__)
 
+BULK_MAX_ROWS = 5000  # Rows accepted per bulk create request
+
+
+def _bulk_rows(request):
+    """Return the list of rows posted to a bulk endpoint, or an error Response."""
+    rows = request.data
+    if not isinstance(rows, list):
+        return None, Response({'error': 'Expected a JSON array.'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(rows) > BULK_MAX_ROWS:
+        return None, Response({'error': f'At most {BULK_MAX_ROWS} rows per request.'}, status=status.HTTP_400_BAD_REQUEST)
+    return rows, None
+
+
+def _export(request, stream, columns, filename):
+    """
+    Shared handler for the export actions.
+    `?output=ndjson|csv` picks the format (`format` is reserved by DRF), and
+    `?since=`/`?until=` restrict rows to a created_at range.
+    """
+    output = request.query_params.get('output', 'ndjson')
+    if output not in EXPORT_FORMATS:
+        return Response({'error': f"output must be one of: {', '.join(EXPORT_FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        since = parse_datetime_param(request, 'since')
+        until = parse_datetime_param(request, 'until')
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return streaming_export(stream(since, until), [column.key for column in columns], output, filename)
+
+
+def _bulk_response(results):
+    """
+    Summarize per-row bulk results.
+    201 when every row was created, 207 when some failed, 400 when none were created.
+    """
+    created = sum(1 for result in results if 'id' in result)
+    failed = len(results) - created
+    if not failed:
+        status_code = status.HTTP_201_CREATED
+    elif created:
+        status_code = status.HTTP_207_MULTI_STATUS
+    else:
+        status_code = status.HTTP_400_BAD_REQUEST
+    return Response({'created': created, 'failed': failed, 'results': results}, status=status_code)
+
+
+def _list_key_suffix(filters, fields=POST_LIST_FIELDS, excerpt_length=POST_EXCERPT_LENGTH) -> str:
+    """Cache key suffix for a post list's author filter, ordering, sparse fieldset and excerpt length."""
+    suffix = f"_author_{filters['author_id']}" if filters['author_id'] is not None else ""
+    if not filters['descending']:
+        suffix += "_oldest_first"
+    if fields != POST_LIST_FIELDS:
+        suffix += f"_fields_{','.join(fields)}"
+    if 'excerpt' in fields and excerpt_length != POST_EXCERPT_LENGTH:
+        suffix += f"_excerpt_{excerpt_length}"
+    return suffix
+
 
 class UserViewSet(viewsets.ModelViewSet):
     """
@@ -20,63 +90,110 @@ class UserViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Retrieve all users from the database using SQLAlchemy."""
-        Session = sessionmaker(bind=engine)
-        with Session() as db_session:
-            return db_session.query(User).all()  # ✅ Agora está correto para SQLAlchemy
+        return self.request.db_session.query(User).all()  # ✅ Agora está correto para SQLAlchemy
+
+    @conditional_list(USERS_NAMESPACE)
+    def list(self, request, *args, **kwargs):
+        """List all users, with validators from the users cache generation."""
+        return super().list(request, *args, **kwargs)
 
     def retrieve(self, request, pk=None, *args, **kwargs):
-        """Retrieve a single user by ID."""
-        Session = sessionmaker(bind=engine)
-        with Session() as db_session:
-            user = db_session.query(User).filter(User.id == pk).first()
-            if not user:
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            serializer = self.get_serializer(user)
-            return Response(serializer.data)
+        """Retrieve a single user by ID; answers 304 while its row version is unchanged."""
+        db_session = request.db_session
+        user = db_session.query(User).filter(User.id == pk).first()
+        if not user:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        etag, last_modified = row_validators('user', user)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        serializer = self.get_serializer(user)
+        return add_validators(Response(serializer.data), etag, last_modified)
 
     def create(self, request, *args, **kwargs):
         """Create a new user."""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        Session = sessionmaker(bind=engine)
-        with Session() as db_session:
-            try:
-                user = self.user_dal.create_user(serializer.validated_data, db_session)
-                db_session.commit()  # 🔥 Garante que a transação foi salva
-                return Response(UserSerializer(user).data, status=status.HTTP_201_CREATED)
-            except Exception as e:
-                logger.error(f"Error creating user: {e}")
-                db_session.rollback()  # Reverte qualquer erro
-                return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        db_session = request.db_session
+        try:
+            user = self.user_dal.create_user(serializer.validated_data, db_session)
+            db_session.commit()  # 🔥 Garante que a transação foi salva
+            bump_generation(USERS_NAMESPACE)  # Invalidate every cached users page
+            return Response(UserSerializer(user).data, status=status.HTTP_201_CREATED)
+        except Exception as e:
+            logger.error(f"Error creating user: {e}")
+            db_session.rollback()  # Reverte qualquer erro
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """Stream every user (optionally within a created_at range) as NDJSON or CSV."""
+        return _export(request, self.user_dal.stream_users, USER_EXPORT_COLUMNS, 'users')
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """
+        Create many users from a JSON array in a single transaction.
+        Each row is validated on its own and reported back by its index.
+        """
+        rows, error = _bulk_rows(request)
+        if error:
+            return error
+        results = [None] * len(rows)
+        valid = []
+        for index, row in enumerate(rows):
+            serializer = self.get_serializer(data=row)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = {'index': index, 'errors': serializer.errors}
+
+        try:
+            created = self.user_dal.bulk_create_users([data for _, data in valid], request.db_session)
+        except Exception as e:
+            logger.error(f"Error bulk creating users: {e}")
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        if created:
+            bump_generation(USERS_NAMESPACE)  # Invalidate every cached users page
+        # Rows skipped by ON CONFLICT DO NOTHING are missing from RETURNING
+        created_by_username = {row.username: row for row in created}
+        for index, data in valid:
+            row = created_by_username.pop(data['username'], None)
+            if row is not None:
+                results[index] = {'index': index, 'id': row.id}
+            else:
+                results[index] = {'index': index, 'errors': {'non_field_errors': ['A user with this username or email already exists.']}}
+        return _bulk_response(results)
 
     def update(self, request, pk=None, *args, **kwargs):
         """Update an existing user."""
-        Session = sessionmaker(bind=engine)
-        with Session() as db_session:
-            user = db_session.query(User).filter(User.id == pk).first()
-            if not user:
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            serializer = self.get_serializer(user, data=request.data, partial=True)
-            serializer.is_valid(raise_exception=True)
-            try:
-                updated_user = self.user_dal.update_user(user, serializer.validated_data, db_session)
-                db_session.commit()
-                return Response(UserSerializer(updated_user).data)
-            except Exception as e:
-                logger.error(f"Error updating user: {e}")
-                db_session.rollback()
-                return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        db_session = request.db_session
+        user = db_session.query(User).filter(User.id == pk).first()
+        if not user:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        serializer = self.get_serializer(user, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        try:
+            updated_user = self.user_dal.update_user(user, serializer.validated_data, db_session)
+            db_session.commit()
+            bump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)  # Posts embed their author
+            return Response(UserSerializer(updated_user).data)
+        except Exception as e:
+            logger.error(f"Error updating user: {e}")
+            db_session.rollback()
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def destroy(self, request, pk=None, *args, **kwargs):
         """Delete a user."""
-        Session = sessionmaker(bind=engine)
-        with Session() as db_session:
-            user = db_session.query(User).filter(User.id == pk).first()
-            if not user:
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            self.user_dal.delete_user(user, db_session)
-            db_session.commit()
-            return Response(status=status.HTTP_204_NO_CONTENT)
+        db_session = request.db_session
+        user = db_session.query(User).filter(User.id == pk).first()
+        if not user:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        self.user_dal.delete_user(user, db_session)
+        db_session.commit()
+        bump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)  # The user's posts are deleted with it
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 class PostViewSet(viewsets.ModelViewSet):
     """
@@ -85,79 +202,245 @@ class PostViewSet(viewsets.ModelViewSet):
     """
     serializer_class = PostSerializer
     post_dal = PostDAL()
+    user_dal = UserDAL()
 
-    def get_queryset(self):
-        """Retrieve all posts from cache or database if not cached."""
-        cache_key = "all_posts"  # Unique cache key for posts
-        cached_posts = cache.get(cache_key)
+    @conditional_list(POSTS_NAMESPACE)
+    def list(self, request, user_id=None, *args, **kwargs):
+        """
+        List posts one bounded page at a time (`?page=`/`?per_page=`).
+        `?cursor=` switches to keyset pagination on (created_at, id).
+        Both accept `?author_id=`, a `?since=`/`?until=` created_at range and
+        `?ordering=created_at|-created_at`; routed as /users/{user_id}/posts/, the
+        author comes from the URL. Every combination is served by a (created_at, id) index.
+        Pages are read as column rows and rendered without PostSerializer (see api/fastjson.py).
+        Posts carry an `excerpt` of their content (`?excerpt_length=` characters), never the
+        content itself. `?fields=` and `?expand=author` pick the fields returned, and only
+        their columns are read.
+        """
+        try:
+            filters = parse_post_filters(request, author_id=user_id)
+            fields = parse_post_list_fields(request)
+            excerpt_length = parse_excerpt_length(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if user_id is not None and not self.user_dal.get_existing_user_ids([user_id], request.db_session):
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        if 'cursor' in request.query_params:
+            return self._list_by_cursor(request, filters, fields, excerpt_length)
+        try:
+            paginator = PageNumberPaginator(request, parse_per_page(request))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        def fetch_page():
+            logger.info("Fetching posts from database")
+            rows = paginator.paginate(
+                lambda page, per_page: self.post_dal.get_post_rows_paginated(
+                    page, per_page, request.db_session, peek_next=True, fields=fields,
+                    excerpt_length=excerpt_length, **filters,
+                )
+            )
+            return render_rows(rows, post_row_mapper(fields)), paginator.has_next
+
+        if filters['since'] is not None or filters['until'] is not None:
+            # Arbitrary date ranges would each get their own cache entry; the index serves them directly
+            results_json, paginator.has_next = fetch_page()
+            return json_response(paginator.render_response(results_json))
 
-        if cached_posts:
-            logger.info("Returning cached posts")
-            return cached_posts
+        # Every page is cached under the posts generation; any post write invalidates them all
+        cached_page = get_or_compute(
+            namespaced_key(POSTS_NAMESPACE, f"page_{paginator.page}_per_page_{paginator.per_page}{_list_key_suffix(filters, fields, excerpt_length)}"),
+            fetch_page,
+            timeout=3600,  # Cache for 1 hour
+        )
+        results_json, paginator.has_next = cached_page
+        return json_response(paginator.render_response(results_json))
 
-        logger.info("Fetching posts from database")
-        Session = sessionmaker(bind=engine)
-        with Session() as db_session:
-            posts = db_session.query(Post).options(joinedload(Post.author)).all()
-            cache.set(cache_key, posts, timeout=3600)  # Cache for 1 hour
-            return posts
+    def _list_by_cursor(self, request, filters, fields, excerpt_length):
+        """Keyset-paginated variant of `list`."""
+        try:
+            paginator = KeysetPaginator(request, parse_per_page(request))
+        except (InvalidCursor, ValueError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        db_session = request.db_session
+        rows = paginator.paginate(
+            lambda limit, after, before: self.post_dal.get_post_rows_keyset(
+                limit, after, before, db_session, fields=fields, excerpt_length=excerpt_length, **filters
+            )
+        )
+        return json_response(paginator.render_response(render_rows(rows, post_row_mapper(fields))))
 
     def retrieve(self, request, pk=None, *args, **kwargs):
-        """Retrieve a single post by ID."""
-        Session = sessionmaker(bind=engine)
-        with Session() as db_session:
-            post = self.post_dal.get_post_by_id(pk, db_session)
-            if not post:
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            serializer = self.get_serializer(post)
-            return Response(serializer.data)
+        """
+        Retrieve a single post by ID; answers 304 while neither the post nor its
+        author (embedded in the body) has changed.
+        Takes the same `?fields=`/`?expand=author` as `list`; without the author, none of
+        its columns are read and only the post's row version makes the ETag.
+        """
+        try:
+            fields = parse_post_fields(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        db_session = request.db_session
+        post = self.post_dal.get_post_by_id(pk, db_session, fields=fields)
+        if not post:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        rows = (post, post.author) if 'author' in fields else (post,)
+        etag, last_modified = row_validators('post', *rows)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        serializer = self.get_serializer(post, fields=fields)
+        return add_validators(Response(serializer.data), etag, last_modified)
 
     def create(self, request, *args, **kwargs):
-        """Create a new post and clear the cache to refresh data."""
-        serializer = self.get_serializer(data=request.data)
+        """
+        Create a new post and clear the cache to refresh data.
+        The author is checked by the posts.author_id foreign key in PostDAL.create_post,
+        so creating a post never runs a separate author lookup.
+        In write-behind mode (see _write_behind) the validated post is queued instead and
+        the response is 202 with a ticket (see api/post_queue.py).
+        """
+        serializer = self.get_serializer(
+            data=request.data, context=dict(self.get_serializer_context(), check_author=False)
+        )
         serializer.is_valid(raise_exception=True)
-        post_data = serializer.validated_data
-        post_data['author_id'] = serializer.validated_data.get('author_id')
-        Session = sessionmaker(bind=engine)
-        with Session() as db_session:
-            try:
-                post = self.post_dal.create_post(post_data, db_session)
-                if not post:
-                    return Response(status=status.HTTP_400_BAD_REQUEST)
-                
-                cache.delete("all_posts")  # Invalidate cache after creation
-                return Response(PostSerializer(post).data, status=status.HTTP_201_CREATED)
-            except Exception as e:
-                logger.error(f"Error creating post: {e}")
-                return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        if self._write_behind(request):
+            return self._enqueue(dict(serializer.validated_data))
+        db_session = request.db_session
+        try:
+            post = self.post_dal.create_post(dict(serializer.validated_data), db_session)
+            if not post:
+                return Response({'author_id': ['Author does not exist.']}, status=status.HTTP_400_BAD_REQUEST)
+
+            bump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)  # Users pages carry the author's posts_count
+            return Response(PostSerializer(post).data, status=status.HTTP_201_CREATED)
+        except Exception as e:
+            logger.error(f"Error creating post: {e}")
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def _write_behind(self, request) -> bool:
+        """
+        Whether to queue this post: always with POST_WRITE_BEHIND "true", only on `Prefer: respond-async`
+        with "prefer". Otherwise no drain_post_queue worker is expected, so the header is ignored.
+        """
+        mode = str(getattr(settings, 'POST_WRITE_BEHIND', 'false')).lower()
+        if mode == 'prefer':
+            return 'respond-async' in request.headers.get('Prefer', '')
+        return mode == 'true'
+
+    def _enqueue(self, post_data):
+        """Queue a validated post for the write-behind worker; 202 pointing at its ticket."""
+        try:
+            ticket = post_queue.enqueue_post(post_data)
+        except Exception as e:
+            logger.error(f"Error queueing post: {e}")
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        location = reverse('post-ticket', kwargs={'ticket': ticket})
+        return Response(
+            {'ticket': ticket, 'status': 'pending', 'status_url': location},
+            status=status.HTTP_202_ACCEPTED, headers={'Location': location},
+        )
+
+    @action(detail=False, methods=['get'], url_path=r'tickets/(?P<ticket>[0-9a-f]{32})', url_name='ticket')
+    def ticket(self, request, ticket=None):
+        """Status of a queued post: pending, created (with its id) or failed (with errors)."""
+        result = post_queue.get_ticket(ticket)
+        if result is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response({'ticket': ticket, **result})
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """Stream every post (optionally within a created_at range) as NDJSON or CSV."""
+        return _export(request, self.post_dal.stream_posts, POST_EXPORT_COLUMNS, 'posts')
+
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """
+        Full-text search over post titles and content, best matches first.
+        `?q=` accepts web-search syntax ("quoted phrases", or, -exclude); pages
+        are followed with the opaque `next` cursor.
+        """
+        query_text = request.query_params.get('q', '').strip()
+        if not query_text:
+            return Response({'error': 'q is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            paginator = RankPaginator(request, parse_per_page(request))
+        except (InvalidCursor, ValueError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        rows = paginator.paginate(
+            lambda limit, after: self.post_dal.search_posts(query_text, limit, after, request.db_session)
+        )
+        return Response(paginator.get_response_data(PostSearchResultSerializer(rows, many=True).data))
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """
+        Create many posts from a JSON array in a single transaction.
+        All author ids are checked with one IN query, and the cache is cleared once per batch.
+        """
+        rows, error = _bulk_rows(request)
+        if error:
+            return error
+        results = [None] * len(rows)
+        valid = []
+        context = dict(self.get_serializer_context(), check_author=False)
+        for index, row in enumerate(rows):
+            serializer = PostSerializer(data=row, context=context)
+            if serializer.is_valid():
+                valid.append((index, dict(serializer.validated_data)))
+            else:
+                results[index] = {'index': index, 'errors': serializer.errors}
+
+        existing_authors = self.user_dal.get_existing_user_ids(
+            (data['author_id'] for _, data in valid), request.db_session
+        )
+        insertable = []
+        for index, data in valid:
+            if data['author_id'] in existing_authors:
+                insertable.append((index, data))
+            else:
+                results[index] = {'index': index, 'errors': {'author_id': ['Author does not exist.']}}
+
+        try:
+            created = self.post_dal.bulk_create_posts([data for _, data in insertable], request.db_session)
+        except Exception as e:
+            logger.error(f"Error bulk creating posts: {e}")
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        for (index, _), row in zip(insertable, created):
+            results[index] = {'index': index, 'id': row.id}
+        if created:
+            bump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)  # Invalidate once for the whole batch
+        return _bulk_response(results)
 
     def update(self, request, pk=None, *args, **kwargs):
         """Update an existing post and clear the cache."""
-        Session = sessionmaker(bind=engine)
-        with Session() as db_session:
-            post = self.post_dal.get_post_by_id(pk, db_session)
-            if not post:
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            serializer = self.get_serializer(post, data=request.data, partial=True)
-            serializer.is_valid(raise_exception=True)
-            try:
-                updated_post = self.post_dal.update_post(post, serializer.validated_data, db_session)
-                cache.delete("all_posts")  # Invalidate cache after update
-                return Response(PostSerializer(updated_post).data)
-            except Exception as e:
-                logger.error(f"Error updating post: {e}")
-                return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        db_session = request.db_session
+        post = self.post_dal.get_post_by_id(pk, db_session)
+        if not post:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        serializer = self.get_serializer(post, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        moved = serializer.validated_data.get('author_id', post.author_id) != post.author_id
+        try:
+            updated_post = self.post_dal.update_post(post, serializer.validated_data, db_session)
+            # A post moved to another author changes both authors' posts_count
+            bump_generation(POSTS_NAMESPACE, *([USERS_NAMESPACE] if moved else []))
+            return Response(PostSerializer(updated_post).data)
+        except Exception as e:
+            logger.error(f"Error updating post: {e}")
+            return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def destroy(self, request, pk=None, *args, **kwargs):
         """Delete a post and clear the cache."""
-        Session = sessionmaker(bind=engine)
-        with Session() as db_session:
-            post = self.post_dal.get_post_by_id(pk, db_session)
-            if not post:
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            self.post_dal.delete_post(post, db_session)
-            cache.delete("all_posts")  # Invalidate cache after deletion
-            return Response(status=status.HTTP_204_NO_CONTENT)
+        db_session = request.db_session
+        post = self.post_dal.get_post_by_id(pk, db_session)
+        if not post:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        self.post_dal.delete_post(post, db_session)
+        bump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)  # Users pages carry the author's posts_count
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class CachedUserViewSet(viewsets.ViewSet):
@@ -166,18 +449,36 @@ class CachedUserViewSet(viewsets.ViewSet):
     Retrieves a paginated list of users and stores results in cache for improved performance.
     """
 
+    @conditional_list(USERS_NAMESPACE)
     def list(self, request):
         """Retrieve a paginated list of users from cache or database."""
+        if 'cursor' in request.query_params:
+            return self._list_by_cursor(request)
         page = int(request.query_params.get('page', 1))
         per_page = int(request.query_params.get('per_page', 10))
-        cache_key = f"users_page_{page}_per_page_{per_page}"
-        cached_users = cache.get(cache_key)
-
-        if not cached_users:
-            user_dal = UserDAL()
-            users = user_dal.get_all_users_paginated(page, per_page)
-            serializer = UserSerializer(users, many=True)
-            cache.set(cache_key, serializer.data, timeout=3600)  # Cache for 1 hour
-            return Response(serializer.data)
-        else:
-            return Response(cached_users)
+        cached_users = get_or_compute(
+            namespaced_key(USERS_NAMESPACE, f"page_{page}_per_page_{per_page}"),
+            lambda: render_rows(UserDAL().get_user_rows_paginated(page, per_page), user_row),
+            timeout=3600,  # Cache for 1 hour
+        )
+        return json_response(cached_users)
+
+    def _list_by_cursor(self, request):
+        """Keyset-paginated variant of `list`, cached per cursor."""
+        try:
+            paginator = KeysetPaginator(request, parse_per_page(request))
+        except (InvalidCursor, ValueError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        cursor = request.query_params.get('cursor') or 'first'
+
+        def fetch_page():
+            rows = paginator.paginate(UserDAL().get_user_rows_keyset)
+            return render_rows(rows, user_row), paginator.next_cursor, paginator.previous_cursor
+
+        cached_page = get_or_compute(
+            namespaced_key(USERS_NAMESPACE, f"cursor_{cursor}_per_page_{paginator.per_page}"),
+            fetch_page,
+            timeout=3600,  # Cache for 1 hour
+        )
+        results_json, paginator.next_cursor, paginator.previous_cursor = cached_page
+        return json_response(paginator.render_response(results_json))
@@ -0,0 +1,199 @@
+"""
+Async user and post endpoints for ASGI deployments.
+
+These mirror UserViewSet/PostViewSet on top of an AsyncSession (asyncpg), so a
+single worker can keep many requests in flight while they wait on Postgres.
+DRF serializers are still used for validation and output; they do no I/O here.
+"""
+import functools
+import json
+import logging
+
+from django.http import HttpResponse, JsonResponse
+from django.urls import path
+from django.views.decorators.csrf import csrf_exempt
+
+from .cache import POSTS_NAMESPACE, USERS_NAMESPACE, abump_generation, json_response, render_json
+from .dal_async import AsyncUserDAL, AsyncPostDAL
+from .db import async_session
+from .filters import POST_LIST_FIELDS
+from .pagination import KeysetPaginator, PageNumberPaginator, InvalidCursor, parse_per_page
+from .serializers import UserSerializer, PostSerializer
+
+# Configure logger for debugging
+logger = logging.getLogger(__name__)
+
+user_dal = AsyncUserDAL()
+post_dal = AsyncPostDAL()
+
+
+def _request_data(request):
+    """Parse a JSON or form-encoded request body; raises ValueError on malformed JSON."""
+    if request.content_type == "application/json":
+        return json.loads(request.body or b"{}")
+    return request.POST
+
+
+def _not_allowed():
+    return JsonResponse({'error': 'Method not allowed.'}, status=405)
+
+
+def _malformed_json():
+    return JsonResponse({'error': 'Malformed JSON.'}, status=400)
+
+
+async def _paginate(request, page_fetch, keyset_fetch, serializer_class):
+    """Shared list handler: page/per_page by default, keyset with `?cursor=`."""
+    try:
+        per_page = parse_per_page(request)
+        if 'cursor' in request.GET:
+            paginator = KeysetPaginator(request, per_page)
+        else:
+            paginator = PageNumberPaginator(request, per_page)
+    except (InvalidCursor, ValueError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    fetch = keyset_fetch if isinstance(paginator, KeysetPaginator) else page_fetch
+    rows = paginator.paginate_rows(await fetch(*paginator.fetch_args()))
+    results_json = render_json(serializer_class(rows, many=True).data)
+    return json_response(paginator.render_response(results_json))
+
+
+@csrf_exempt
+async def user_list(request):
+    """GET: paginated users. POST: create a user."""
+    async with async_session() as session:
+        if request.method == 'GET':
+            return await _paginate(
+                request,
+                lambda page, per_page: user_dal.get_all_users_paginated(page, per_page, session, peek_next=True),
+                lambda limit, after, before: user_dal.get_users_keyset(limit, after, before, session),
+                UserSerializer,
+            )
+        if request.method == 'POST':
+            try:
+                data = _request_data(request)
+            except ValueError:
+                return _malformed_json()
+            serializer = UserSerializer(data=data)
+            if not serializer.is_valid():
+                return JsonResponse(serializer.errors, status=400)
+            try:
+                user = await user_dal.create_user(serializer.validated_data, session)
+            except Exception as e:
+                logger.error(f"Error creating user: {e}")
+                await session.rollback()
+                return JsonResponse({'error': str(e)}, status=500)
+            await abump_generation(USERS_NAMESPACE)  # Invalidate every cached users page
+            return json_response(render_json(UserSerializer(user).data), status=201)
+        return _not_allowed()
+
+
+@csrf_exempt
+async def user_detail(request, pk: int):
+    """GET, PUT/PATCH or DELETE a single user."""
+    async with async_session() as session:
+        user = await user_dal.get_user_by_id(pk, session)
+        if not user:
+            return HttpResponse(status=404)
+        if request.method == 'GET':
+            return json_response(render_json(UserSerializer(user).data))
+        if request.method in ('PUT', 'PATCH'):
+            try:
+                data = _request_data(request)
+            except ValueError:
+                return _malformed_json()
+            serializer = UserSerializer(user, data=data, partial=True)
+            if not serializer.is_valid():
+                return JsonResponse(serializer.errors, status=400)
+            try:
+                user = await user_dal.update_user(user, serializer.validated_data, session)
+            except Exception as e:
+                logger.error(f"Error updating user: {e}")
+                await session.rollback()
+                return JsonResponse({'error': str(e)}, status=500)
+            await abump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)  # Posts embed their author
+            return json_response(render_json(UserSerializer(user).data))
+        if request.method == 'DELETE':
+            await user_dal.delete_user(user, session)
+            await abump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)  # The user's posts are deleted with it
+            return HttpResponse(status=204)
+        return _not_allowed()
+
+
+@csrf_exempt
+async def post_list(request):
+    """GET: paginated posts. POST: create a post."""
+    async with async_session() as session:
+        if request.method == 'GET':
+            return await _paginate(
+                request,
+                lambda page, per_page: post_dal.get_all_posts_paginated(page, per_page, session, peek_next=True),
+                lambda limit, after, before: post_dal.get_posts_keyset(limit, after, before, session),
+                functools.partial(PostSerializer, fields=POST_LIST_FIELDS),
+            )
+        if request.method == 'POST':
+            # Unknown authors are rejected by the foreign key in AsyncPostDAL.create_post.
+            try:
+                data = _request_data(request)
+            except ValueError:
+                return _malformed_json()
+            serializer = PostSerializer(data=data, context={'check_author': False})
+            if not serializer.is_valid():
+                return JsonResponse(serializer.errors, status=400)
+            try:
+                post = await post_dal.create_post(dict(serializer.validated_data), session)
+            except Exception as e:
+                logger.error(f"Error creating post: {e}")
+                await session.rollback()
+                return JsonResponse({'error': str(e)}, status=500)
+            if not post:
+                return JsonResponse({'author_id': ['Author does not exist.']}, status=400)
+            await abump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)  # Users pages carry the author's posts_count
+            return json_response(render_json(PostSerializer(post).data), status=201)
+        return _not_allowed()
+
+
+@csrf_exempt
+async def post_detail(request, pk: int):
+    """GET, PUT/PATCH or DELETE a single post."""
+    async with async_session() as session:
+        post = await post_dal.get_post_by_id(pk, session)
+        if not post:
+            return HttpResponse(status=404)
+        if request.method == 'GET':
+            return json_response(render_json(PostSerializer(post).data))
+        if request.method in ('PUT', 'PATCH'):
+            try:
+                data = _request_data(request)
+            except ValueError:
+                return _malformed_json()
+            serializer = PostSerializer(post, data=data, partial=True, context={'check_author': False})
+            if not serializer.is_valid():
+                return JsonResponse(serializer.errors, status=400)
+            if 'author_id' in serializer.validated_data and not await user_dal.get_user_by_id(serializer.validated_data['author_id'], session):
+                return JsonResponse({'author_id': ['Author does not exist.']}, status=400)
+            moved = serializer.validated_data.get('author_id', post.author_id) != post.author_id
+            try:
+                post = await post_dal.update_post(post, serializer.validated_data, session)
+            except Exception as e:
+                logger.error(f"Error updating post: {e}")
+                await session.rollback()
+                return JsonResponse({'error': str(e)}, status=500)
+            # A post moved to another author changes both authors' posts_count
+            await abump_generation(POSTS_NAMESPACE, *([USERS_NAMESPACE] if moved else []))
+            return json_response(render_json(PostSerializer(post).data))
+        if request.method == 'DELETE':
+            await post_dal.delete_post(post, session)
+            await abump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)  # Users pages carry the author's posts_count
+            return HttpResponse(status=204)
+        return _not_allowed()
+
+
+# URL patterns for the async API (mounted under /api/v1/async/)
+urlpatterns = [
+    path('users/', user_list, name='async-user-list'),
+    path('users/<int:pk>/', user_detail, name='async-user-detail'),
+    path('posts/', post_list, name='async-post-list'),
+    path('posts/<int:pk>/', post_detail, name='async-post-detail'),
+]
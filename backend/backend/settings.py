@@ -29,6 +29,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.middleware.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -37,6 +38,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.middleware.SQLAlchemySessionMiddleware",
 ]
 
 ROOT_URLCONF = "backend.urls"
@@ -71,6 +73,31 @@ DATABASES = {
     }
 }
 
+# Optional read replica: safe requests and DAL getters read from it (api/models.py)
+if os.environ.get("DATABASE_REPLICA_HOST") or os.environ.get("DATABASE_REPLICA_NAME"):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("DATABASE_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "USER": os.environ.get("DATABASE_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.environ.get("DATABASE_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "HOST": os.environ.get("DATABASE_REPLICA_HOST", DATABASES["default"]["HOST"]),
+        "PORT": os.environ.get("DATABASE_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
+# Seconds a client reads from the primary after its own write (at least the replication lag)
+REPLICA_STICKY_SECONDS = int(os.environ.get("DATABASE_REPLICA_STICKY_SECONDS", "5"))
+# Seconds reads stay on the primary after the replica failed
+REPLICA_RETRY_SECONDS = int(os.environ.get("DATABASE_REPLICA_RETRY_SECONDS", "30"))
+
+# SQLAlchemy engine and connection pool (api/models.py)
+SQLALCHEMY_ENGINE_OPTIONS = {
+    "pool_size": int(os.environ.get("DATABASE_POOL_SIZE", "5")),
+    "max_overflow": int(os.environ.get("DATABASE_MAX_OVERFLOW", "10")),
+    "pool_pre_ping": os.environ.get("DATABASE_POOL_PRE_PING", "true").lower() == "true",
+    "pool_recycle": int(os.environ.get("DATABASE_POOL_RECYCLE", "1800")),  # Seconds
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -106,8 +133,27 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": (
+        "api.instrumentation.MeasuredJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
+# Per-request DB/cache/serialization timings in a Server-Timing response header
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "true").lower() == "true"
+
+# Prometheus counters and histograms served at /metrics (see api/metrics.py)
+PROMETHEUS_METRICS = os.environ.get("PROMETHEUS_METRICS", "true").lower() == "true"
+
+# Characters of content returned as `excerpt` on post lists (api/filters.py; ?excerpt_length= overrides)
+POST_EXCERPT_LENGTH = int(os.environ.get("POST_EXCERPT_LENGTH", "200"))
+
+# Write-behind post creation: POST /posts/ answers 202 and `manage.py drain_post_queue` inserts (api/post_queue.py).
+# "true" queues every post, "prefer" only requests sending `Prefer: respond-async`, "false" none
+# (the default: no worker runs, so the header is ignored)
+POST_WRITE_BEHIND = os.environ.get("POST_WRITE_BEHIND", "false").lower()
+POST_QUEUE_REDIS_URL = os.environ.get("POST_QUEUE_REDIS_URL", "redis://127.0.0.1:6379/2")
+
 # Simple JWT
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
@@ -119,8 +165,15 @@ SIMPLE_JWT = {
 # Caching (Optional for Development)
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        # Redis plus an in-process LRU for the hottest keys (see api/cache_backends.py)
+        "BACKEND": "api.cache_backends.TwoTierRedisCache",
         "LOCATION": "redis://127.0.0.1:6379/1",
+        "LOCAL_CACHE": {
+            "KEY_PREFIXES": ["posts:", "users:", "generation:"],
+            "MAX_ENTRIES": int(os.environ.get("LOCAL_CACHE_MAX_ENTRIES", "1000")),
+            "MAX_BYTES": int(os.environ.get("LOCAL_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+            "TIMEOUT": int(os.environ.get("LOCAL_CACHE_TIMEOUT", "5")),  # Seconds
+        },
     }
 }
 
@@ -135,7 +188,12 @@ SPECTACULAR_SETTINGS = {
 }
 
 # CORS
-CORS_ALLOW_ALL_ORIGINS = True  # Allow all origins for simplicity in development
+# The frontend sends credentials (the read-replica `primary_until` cookie), which needs an
+# explicit list of origins instead of "*"
+CORS_ALLOWED_ORIGINS = os.environ.get(
+    "CORS_ALLOWED_ORIGINS", "http://127.0.0.1:3000,http://localhost:3000"
+).split(",")
+CORS_ALLOW_CREDENTIALS = True
 
 # Logging (Optional for Development)
 LOGGING = {
@@ -0,0 +1,89 @@
+"""
+Sync (WSGI, thread per request) vs async (ASGI, asyncpg) posts list under concurrency.
+
+Both paths go through the full middleware stack in-process: the sync run uses
+Django's test Client from a thread pool, the async run fires requests with
+AsyncClient on a single event loop. Requests read the first cursor page, which
+is never cached, so every request waits on Postgres.
+
+    python -m benchmarks.bench_async --requests 2000 --concurrency 100
+"""
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import print_table, setup_django, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--posts", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import AsyncClient, Client
+    from api.db import get_async_engine
+    from api.models import Post, Session, User
+
+    with Session() as db_session:
+        author = User(username="bench_async", email="bench_async@example.com", password="password")
+        db_session.add(author)
+        db_session.add_all(Post(title=f"Post {i}", content="Content", author=author) for i in range(args.posts))
+        db_session.commit()
+        author_id = author.id
+
+    path = "/api/v1/posts/?cursor=&per_page=20"
+    async_path = "/api/v1/async/posts/?cursor=&per_page=20"
+
+    local = threading.local()
+
+    def sync_request(_):
+        if not hasattr(local, "client"):
+            local.client = Client()
+        start = time.perf_counter()
+        response = local.client.get(path)
+        assert response.status_code == 200, response.status_code
+        return (time.perf_counter() - start) * 1000
+
+    def run_sync():
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            samples = list(pool.map(sync_request, range(args.requests)))
+        return summarize(samples, time.perf_counter() - start)
+
+    async def run_async():
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(async_path)
+                assert response.status_code == 200, response.status_code
+                return (time.perf_counter() - start) * 1000
+
+        try:
+            start = time.perf_counter()
+            samples = await asyncio.gather(*(one() for _ in range(args.requests)))
+            return summarize(samples, time.perf_counter() - start)
+        finally:
+            await get_async_engine().dispose()
+
+    try:
+        print_table({
+            f"sync threads={args.concurrency}": run_sync(),
+            f"async in-flight={args.concurrency}": asyncio.run(run_async()),
+        })
+    finally:
+        with Session() as db_session:
+            db_session.query(Post).filter(Post.author_id == author_id).delete()
+            db_session.query(User).filter(User.id == author_id).delete()
+            db_session.commit()
+
+
+if __name__ == "__main__":
+    main()
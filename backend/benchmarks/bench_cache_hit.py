@@ -0,0 +1,70 @@
+"""
+Cache-hit latency for the posts list: pickled ORM objects vs. rendered JSON bytes.
+
+"before" replays the old hit path: unpickle `Post` instances with their joined
+author, run `PostSerializer` and render JSON. "after" is the current path: fetch
+the cached bytes and splice them into the page envelope.
+
+    python -m benchmarks.bench_cache_hit --per-page 10 --iterations 2000
+"""
+import argparse
+
+from benchmarks.common import measure, print_table, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.http import HttpResponse
+    from sqlalchemy.orm import joinedload
+    from api.cache import json_response, render_json, splice_results
+    from api.models import Post, Session, User
+    from api.serializers import PostSerializer
+
+    with Session() as db_session:
+        author = User(username="bench_cache_hit", email="bench_cache_hit@example.com", password="password")
+        db_session.add(author)
+        db_session.add_all(
+            Post(title=f"Post {i}", content="Lorem ipsum dolor sit amet. " * 20, author=author)
+            for i in range(args.per_page)
+        )
+        db_session.commit()
+        posts = (
+            db_session.query(Post).options(joinedload(Post.author))
+            .filter(Post.author_id == author.id).all()
+        )
+        db_session.expunge_all()
+
+    envelope = {"page": 1, "per_page": args.per_page, "next": None, "previous": None}
+    cache.set("bench_orm_posts", posts, timeout=600)
+    cache.set("bench_bytes_posts", (render_json(PostSerializer(posts, many=True).data), False), timeout=600)
+
+    def orm_hit():
+        cached = cache.get("bench_orm_posts")
+        data = dict(envelope, results=PostSerializer(cached, many=True).data)
+        return HttpResponse(render_json(data), content_type="application/json")
+
+    def bytes_hit():
+        results_json, _ = cache.get("bench_bytes_posts")
+        return json_response(splice_results(envelope, results_json))
+
+    try:
+        print_table({
+            "before: pickled ORM + serializer": measure(orm_hit, args.iterations),
+            "after: rendered JSON bytes": measure(bytes_hit, args.iterations),
+        })
+    finally:
+        cache.delete_many(["bench_orm_posts", "bench_bytes_posts"])
+        with Session() as db_session:
+            db_session.query(Post).filter(Post.author_id == author.id).delete()
+            db_session.query(User).filter(User.id == author.id).delete()
+            db_session.commit()
+
+
+if __name__ == "__main__":
+    main()
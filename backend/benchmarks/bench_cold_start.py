@@ -0,0 +1,50 @@
+"""
+Cold start: time for a fresh interpreter to set up Django and import the API.
+
+Each run starts a new process that calls django.setup() and imports the URL
+conf (every view, serializer, DAL and model), which is what a worker does
+before serving its first request. The "db down" scenario points the app at a
+closed port to check that startup no longer depends on the database.
+
+    python -m benchmarks.bench_cold_start --runs 20
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import print_table, summarize
+
+STARTUP = (
+    "import os; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings'); "
+    "import django; django.setup(); import api.urls"
+)
+
+
+def cold_start(env: dict) -> float:
+    """Milliseconds for one process to start; raises if it fails."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", STARTUP], env=env, check=True, capture_output=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    results = {}
+    for name, overrides in (("db up", {}), ("db down", {"DATABASE_PORT": "1"})):
+        env = dict(os.environ, **overrides)
+        try:
+            samples = [cold_start(env) for _ in range(args.runs)]
+        except subprocess.CalledProcessError as e:
+            print(f"{name}: startup failed: {e.stderr.decode().strip().splitlines()[-1]}")
+            continue
+        results[f"import api ({name})"] = summarize(samples)
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Bandwidth and memory of post list pages with large posts: full content vs. excerpts.
+
+Creates --posts posts of --content-kb KB each (random words, so Postgres cannot
+compress them to nothing), then reads one list page (--per-page rows) the way
+lists used to (content column) and the way they do now (left(content, N)):
+
+- response bytes: the rendered JSON page
+- peak Python memory while reading and rendering the page (tracemalloc)
+- latency of the query + render, and of a whole uncached request
+
+    python -m benchmarks.bench_excerpt --posts 500 --content-kb 200
+"""
+import argparse
+import random
+import tracemalloc
+
+from benchmarks.common import measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--content-kb", type=int, default=200)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+    from api.cache import POSTS_NAMESPACE, bump_generation
+    from api.dal import AUTHOR_LIST_COLUMNS, post_list_columns
+    from api.fastjson import post_row_mapper, render_rows
+    from api.filters import POST_LIST_FIELDS
+    from api.models import Post, Session, User
+
+    rng = random.Random(0)
+    words = [f"word{i}" for i in range(5000)]
+    with Session() as db_session:
+        author = User(username="bench_excerpt", email="bench_excerpt@example.com", password="password")
+        db_session.add(author)
+        db_session.flush()
+        for i in range(args.posts):
+            content = " ".join(rng.choices(words, k=args.content_kb * 1024 // 8))[: args.content_kb * 1024]
+            db_session.add(Post(title=f"Large post {i}", content=content, author=author))
+        db_session.commit()
+        author_id = author.id
+
+    # The list shape before excerpts: the whole content column
+    full_columns = (Post.id, Post.title, Post.content, Post.created_at) + AUTHOR_LIST_COLUMNS
+    full_fields = ("id", "title", "content", "created_at", "author")
+    excerpt_columns = post_list_columns(POST_LIST_FIELDS)
+    client = Client()
+    try:
+        with Session() as db_session:
+            def page(columns, fields):
+                rows = (
+                    db_session.query(*columns).join(Post.author).filter(Post.author_id == author_id)
+                    .order_by(Post.created_at.desc(), Post.id.desc()).limit(args.per_page).all()
+                )
+                return render_rows(rows, post_row_mapper(fields))
+
+            print(f"{args.posts} posts of {args.content_kb} KB, {args.per_page} per page\n")
+            print(f"{'list page':<12}{'bytes':>14}{'peak memory':>16}{'query+render p50':>20}")
+            for name, columns, fields in (
+                ("content", full_columns, full_fields), ("excerpt", excerpt_columns, POST_LIST_FIELDS),
+            ):
+                tracemalloc.start()
+                body = page(columns, fields)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                stats = measure(lambda: page(columns, fields), args.iterations, warmup=2)
+                print(f"{name:<12}{len(body):>14,}{peak:>16,}{stats['p50_ms']:>17.2f} ms")
+
+        def request():
+            bump_generation(POSTS_NAMESPACE)
+            return client.get(f"/api/v1/users/{author_id}/posts/?per_page={args.per_page}")
+
+        stats = measure(request, args.iterations, warmup=2)
+        print(f"\nGET /users/{{id}}/posts/ uncached: {len(request().content):,} bytes, p50 {stats['p50_ms']:.2f} ms")
+    finally:
+        with Session() as db_session:
+            db_session.query(Post).filter(Post.author_id == author_id).delete()
+            db_session.query(User).filter(User.id == author_id).delete()
+            db_session.commit()
+
+
+if __name__ == "__main__":
+    main()
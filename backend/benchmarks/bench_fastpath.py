@@ -0,0 +1,75 @@
+"""
+Posts list rendering: ORM objects + PostSerializer vs. column rows + orjson.
+
+"serializer" is the old uncached path: load `Post` objects with a joinedload
+of the author, run PostSerializer (a nested UserSerializer per post) and
+render with JSONRenderer. "fast path" reads POST_LIST_COLUMNS rows and
+renders them with api.fastjson. Each is timed with and without the query, so
+the serialization share is visible on its own. "request" rows go through
+the full view (the first cursor page, which is never cached).
+
+    python -m benchmarks.bench_fastpath --per-page 100 --iterations 500
+"""
+import argparse
+
+from benchmarks.common import measure, print_table, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+    from api.cache import render_json
+    from api.dal import PostDAL
+    from api.fastjson import post_row, render_rows
+    from api.models import Post, Session, User
+    from api.filters import POST_LIST_FIELDS
+    from api.serializers import PostSerializer
+
+    per_page = args.per_page
+    with Session() as db_session:
+        author = User(username="bench_fastpath", email="bench_fastpath@example.com", password="password")
+        db_session.add(author)
+        db_session.add_all(
+            Post(title=f"Post {i}", content="Lorem ipsum dolor sit amet " * 20, author=author)
+            for i in range(per_page * 2)
+        )
+        db_session.commit()
+        author_id = author.id
+
+    dal = PostDAL()
+    client = Client()
+    try:
+        with Session() as db_session:
+            posts = dal.get_all_posts_paginated(2, per_page, db_session)
+            rows = dal.get_post_rows_paginated(2, per_page, db_session)
+            assert render_rows(rows, post_row) == render_json(PostSerializer(posts, many=True, fields=POST_LIST_FIELDS).data)
+
+            results = {
+                f"serializer render only n={per_page}": measure(
+                    lambda: render_json(PostSerializer(posts, many=True, fields=POST_LIST_FIELDS).data), args.iterations),
+                f"fast path render only n={per_page}": measure(
+                    lambda: render_rows(rows, post_row), args.iterations),
+                f"serializer query+render n={per_page}": measure(
+                    lambda: render_json(PostSerializer(dal.get_all_posts_paginated(2, per_page, db_session), many=True, fields=POST_LIST_FIELDS).data),
+                    args.iterations),
+                f"fast path query+render n={per_page}": measure(
+                    lambda: render_rows(dal.get_post_rows_paginated(2, per_page, db_session), post_row),
+                    args.iterations),
+            }
+        results[f"request cursor n={per_page}"] = measure(
+            lambda: client.get(f"/api/v1/posts/?cursor=&per_page={per_page}"), args.iterations)
+        print_table(results)
+    finally:
+        with Session() as db_session:
+            db_session.query(Post).filter(Post.author_id == author_id).delete()
+            db_session.query(User).filter(User.id == author_id).delete()
+            db_session.commit()
+
+
+if __name__ == "__main__":
+    main()
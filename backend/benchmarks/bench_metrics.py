@@ -0,0 +1,79 @@
+"""
+Overhead of the Prometheus instrumentation (api/metrics.py).
+
+Runs every scenario twice, in a fresh process each: with in-process values
+(single worker) and in multiprocess mode (PROMETHEUS_MULTIPROC_DIR set, values
+in memory-mapped files, as under gunicorn). "request" rows serve a cached
+posts page through the full middleware stack with recording switched off and
+on; the other rows time the individual recording calls a request makes.
+
+    python -m benchmarks.bench_metrics --iterations 5000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import measure, print_table, setup_django
+
+
+def run(iterations: int):
+    setup_django()
+    from django.test import Client, RequestFactory
+    from django.http import HttpResponse
+    from api import metrics
+    from api.models import get_engine
+
+    client = Client()
+    path = "/api/v1/posts/?per_page=20"
+    client.get(path)  # Fill the page cache
+
+    def request():
+        client.get(path)
+
+    factory_request = RequestFactory().get(path)
+    factory_request.resolver_match = None
+    response = HttpResponse()
+
+    def checkout():
+        get_engine().connect().close()
+
+    results = {}
+    metrics.ENABLED = False
+    results["request, metrics off"] = measure(request, iterations)
+    results["pool checkout, metrics off"] = measure(checkout, iterations)
+    metrics.ENABLED = True
+    results["request, metrics on"] = measure(request, iterations)
+    results["pool checkout, metrics on"] = measure(checkout, iterations)
+    results["observe_request"] = measure(lambda: metrics.observe_request(factory_request, response, 0.001), iterations)
+    results["observe_cache_lookup (L2)"] = measure(
+        lambda: metrics.observe_cache_lookup("posts:1:page_1_per_page_20", "l2_hit", 0.0002), iterations
+    )
+    print_table(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--mode", choices=["inprocess", "multiprocess"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.iterations)
+        return
+    for mode in ("inprocess", "multiprocess"):
+        env = dict(os.environ)
+        env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+        with tempfile.TemporaryDirectory() as directory:
+            if mode == "multiprocess":
+                env["PROMETHEUS_MULTIPROC_DIR"] = directory
+            print(f"\n{mode}")
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_metrics", "--mode", mode, "--iterations", str(args.iterations)],
+                env=env, check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
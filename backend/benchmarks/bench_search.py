@@ -0,0 +1,109 @@
+"""
+Full-text search latency on a large seeded corpus.
+
+Posts are generated server-side with generate_series, so seeding 1M rows
+takes minutes instead of a round trip per row. Titles come from a small
+vocabulary; content words are drawn from a skewed ("Zipf-like") distribution
+over TERMS synthetic terms, so queries range from matching a large share of
+the corpus (w1) to a handful of rows (w9000). Search vectors are filled by the
+same expression PostDAL writes, and `PostDAL.search_posts` is timed for first
+pages and cursor pages. Latency grows with the number of matching rows, since
+every match is ranked before the LIMIT.
+
+    python -m benchmarks.bench_search --posts 1000000 --iterations 200
+    python -m benchmarks.bench_search --keep        # keep the corpus for later runs
+"""
+import argparse
+import time
+
+from benchmarks.common import measure, print_table, setup_django
+
+VOCABULARY = (
+    "postgres index query cache redis python django latency throughput search vector "
+    "engine session pool cursor replica stream batch shard commit rollback metric "
+    "worker queue lock snapshot vacuum planner join tuple page memory"
+).split()
+TERMS = 10000
+QUERIES = ["postgres", "w1", "w40 w90", '"cache latency"', "w9000", "redis -w3", "vacuum or w700"]
+BENCH_USERNAME = "bench_search"
+
+
+def seed(connection, author_id: int, posts: int):
+    from sqlalchemy import text
+
+    words = "ARRAY[" + ",".join(f"'{w}'" for w in VOCABULARY) + "]"
+    connection.execute(text(f"""
+        INSERT INTO posts (title, content, author_id, created_at)
+        SELECT
+            initcap(({words})[1 + (g * 7) % {len(VOCABULARY)}] || ' ' || ({words})[1 + (g * 13) % {len(VOCABULARY)}]),
+            (SELECT string_agg('w' || floor({TERMS} * power(random(), 4))::int, ' ')
+               FROM generate_series(1, 40 + g % 20)),
+            :author_id,
+            now() - make_interval(secs => g)
+        FROM generate_series(1, :posts) AS g
+    """), {"author_id": author_id, "posts": posts})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="Leave the seeded posts in place.")
+    args = parser.parse_args()
+
+    setup_django()
+    from sqlalchemy import update
+    from api.dal import PostDAL
+    from api.models import Post, Session, User, get_engine, search_document
+
+    with Session() as db_session:
+        author = db_session.query(User).filter(User.username == BENCH_USERNAME).first()
+        if author is None:
+            author = User(username=BENCH_USERNAME, email=f"{BENCH_USERNAME}@example.com", password="password")
+            db_session.add(author)
+            db_session.commit()
+        author_id = author.id
+        existing = db_session.query(Post).filter(Post.author_id == author_id).count()
+
+    if existing < args.posts:
+        start = time.perf_counter()
+        with get_engine().begin() as connection:
+            seed(connection, author_id, args.posts - existing)
+            connection.execute(
+                update(Post)
+                .where(Post.author_id == author_id, Post.search_vector.is_(None))
+                .values(search_vector=search_document(Post.title, Post.content))
+            )
+        with get_engine().connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.exec_driver_sql("ANALYZE posts")
+        print(f"seeded {args.posts - existing} posts in {time.perf_counter() - start:.1f}s")
+
+    dal = PostDAL()
+    results = {}
+    try:
+        with Session() as db_session:
+            for query_text in QUERIES:
+                first_page = dal.search_posts(query_text, args.per_page + 1, session=db_session)
+                results[f"first page q={query_text}"] = measure(
+                    lambda q=query_text: dal.search_posts(q, args.per_page + 1, session=db_session),
+                    iterations=args.iterations, warmup=5,
+                )
+                if len(first_page) > args.per_page:
+                    last = first_page[args.per_page - 1]
+                    results[f"next page q={query_text}"] = measure(
+                        lambda q=query_text, after=(last.rank, last.id): dal.search_posts(
+                            q, args.per_page + 1, after, session=db_session),
+                        iterations=args.iterations, warmup=5,
+                    )
+        print_table(results)
+    finally:
+        if not args.keep:
+            with Session() as db_session:
+                db_session.query(Post).filter(Post.author_id == author_id).delete()
+                db_session.query(User).filter(User.id == author_id).delete()
+                db_session.commit()
+
+
+if __name__ == "__main__":
+    main()
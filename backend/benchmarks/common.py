@@ -0,0 +1,63 @@
+"""
+Shared helpers for the benchmark scripts.
+Run benchmarks from the `backend/` directory, e.g. `python -m benchmarks.bench_cache_hit`.
+"""
+import logging
+import os
+import statistics
+import time
+
+
+def setup_django():
+    """Configure Django so benchmarks can import the `api` app."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+    import django
+
+    django.setup()
+    # Per-request INFO logs go to the console and would dominate the timings
+    logging.disable(logging.INFO)
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def measure(fn, iterations: int = 1000, warmup: int = 50) -> dict:
+    """Call `fn` repeatedly and return latency statistics in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def summarize(samples, wall_seconds: float = None) -> dict:
+    """
+    Latency statistics (ms) and throughput for a list of samples in milliseconds.
+    Pass `wall_seconds` for concurrent runs, where throughput is not 1 / mean latency.
+    """
+    total = wall_seconds * 1000 if wall_seconds is not None else sum(samples)
+    return {
+        "iterations": len(samples),
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+        "ops_per_sec": len(samples) / (total / 1000) if total else 0.0,
+    }
+
+
+def print_table(results: dict):
+    """Print a {name: stats} mapping as an aligned table."""
+    print(f"{'scenario':<36}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'ops/s':>12}")
+    for name, stats in results.items():
+        print(
+            f"{name:<36}{stats['mean_ms']:>10.3f}{stats['p50_ms']:>10.3f}"
+            f"{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}{stats['ops_per_sec']:>12.0f}"
+        )
@@ -0,0 +1,139 @@
+"""
+Seed users and posts for benchmarking with COPY.
+
+Rows are generated deterministically from --seed, so two runs with the same
+arguments produce the same dataset. Users are created over the last --days
+days; each post gets a random author and a creation time after its author's.
+Rows are streamed to Postgres with COPY ... FROM STDIN in batches, which is
+orders of magnitude faster than INSERTs at these volumes.
+
+    python -m benchmarks.seed --users 100000 --posts 5000000 --reset
+
+The posts and users tables must be empty unless --reset is given, which
+TRUNCATEs both. Search vectors are only filled with --search-vectors (the
+UPDATE takes minutes on millions of posts and only the search scenarios need it).
+"""
+import argparse
+import csv
+import datetime
+import io
+import random
+import time
+
+from benchmarks.common import setup_django
+
+WORDS = (
+    "postgres index query cache redis python django latency throughput search vector "
+    "engine session pool cursor replica stream batch shard commit rollback metric "
+    "worker queue lock snapshot vacuum planner join tuple page memory"
+).split()
+BATCH_ROWS = 100_000  # Rows per COPY statement
+
+
+def _copy(cursor, table: str, columns, rows):
+    """COPY `rows` (tuples in `columns` order) into `table`, BATCH_ROWS at a time; returns the row count."""
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    count = 0
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % BATCH_ROWS == 0:
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        buffer.seek(0)
+        cursor.copy_expert(statement, buffer)
+    return count
+
+
+def user_rows(rng: random.Random, count: int, start: datetime.datetime, span: float):
+    """(username, email, password, created_at, updated_at), oldest first."""
+    offsets = sorted(rng.random() * span for _ in range(count))
+    for index, offset in enumerate(offsets):
+        created_at = start + datetime.timedelta(seconds=offset)
+        yield f"seed_user_{index}", f"seed_user_{index}@example.com", "password", created_at, created_at
+
+
+def post_rows(rng: random.Random, count: int, authors, end: datetime.datetime):
+    """(title, content, created_at, updated_at, author_id) with a random author and time after it joined."""
+    for _ in range(count):
+        author_id, joined = authors[rng.randrange(len(authors))]
+        created_at = joined + (end - joined) * rng.random()
+        title = " ".join(rng.choices(WORDS, k=rng.randint(3, 8))).capitalize()
+        content = " ".join(rng.choices(WORDS, k=rng.randint(20, 120)))
+        yield title, content, created_at, created_at, author_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--posts", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=365, help="Time span the rows are spread over.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="TRUNCATE users and posts first.")
+    parser.add_argument("--search-vectors", action="store_true", help="Fill posts.search_vector afterwards.")
+    args = parser.parse_args()
+
+    setup_django()
+    from api.cache import POSTS_NAMESPACE, USERS_NAMESPACE, bump_generation
+    from api.models import get_engine
+
+    rng = random.Random(args.seed)
+    # Fixed end date keeps the data identical between runs
+    end = datetime.datetime(2025, 1, 1)
+    start = end - datetime.timedelta(days=args.days)
+
+    raw = get_engine().raw_connection()
+    try:
+        cursor = raw.cursor()
+        if args.reset:
+            cursor.execute("TRUNCATE posts, users RESTART IDENTITY CASCADE")
+        else:
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM users) OR EXISTS (SELECT 1 FROM posts)")
+            if cursor.fetchone()[0]:
+                raise SystemExit("users/posts are not empty; pass --reset to replace them.")
+
+        began = time.perf_counter()
+        _copy(cursor, "users", ("username", "email", "password", "created_at", "updated_at"),
+              user_rows(rng, args.users, start, (end - start).total_seconds()))
+        cursor.execute("SELECT id, created_at FROM users ORDER BY id")
+        authors = cursor.fetchall()
+        print(f"users: {args.users} rows in {time.perf_counter() - began:.1f}s")
+
+        began = time.perf_counter()
+        _copy(cursor, "posts", ("title", "content", "created_at", "updated_at", "author_id"),
+              post_rows(rng, args.posts, authors, end))
+        # COPY bypasses PostDAL, so set the denormalized counts with one aggregate
+        cursor.execute(
+            "UPDATE users SET posts_count = counts.n "
+            "FROM (SELECT author_id, count(*) AS n FROM posts GROUP BY author_id) AS counts "
+            "WHERE users.id = counts.author_id"
+        )
+        print(f"posts: {args.posts} rows in {time.perf_counter() - began:.1f}s")
+        raw.commit()
+
+        if args.search_vectors:
+            began = time.perf_counter()
+            cursor.execute(
+                "UPDATE posts SET search_vector = "
+                "setweight(to_tsvector('english'::regconfig, title), 'A') || "
+                "setweight(to_tsvector('english'::regconfig, content), 'B')"
+            )
+            raw.commit()
+            print(f"search vectors in {time.perf_counter() - began:.1f}s")
+
+        raw.set_session(autocommit=True)
+        cursor.execute("VACUUM ANALYZE users")
+        cursor.execute("VACUUM ANALYZE posts")
+    finally:
+        raw.close()
+
+    bump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)  # Cached pages describe the old rows
+
+
+if __name__ == "__main__":
+    main()
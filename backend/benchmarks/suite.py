@@ -0,0 +1,257 @@
+"""
+End-to-end benchmark suite over a seeded dataset (see benchmarks/seed.py).
+
+Every scenario sends requests through the full middleware stack with Django's
+test Client and records latency (mean, p50/p95/p99), throughput and SQL
+statements per request. "uncached" scenarios bump the cache generation before
+each request (outside the timed section); "cached" ones are warmed first.
+Scenarios cover UserViewSet, PostViewSet and CachedUserViewSet: list,
+retrieve, create, cached/uncached pages and deep pagination (OFFSET pages vs.
+cursors at the same depth).
+
+Results are written as JSON so runs can be compared:
+
+    python -m benchmarks.seed --users 100000 --posts 5000000 --reset
+    python -m benchmarks.suite --output before.json
+    ... change something ...
+    python -m benchmarks.suite --output after.json --compare before.json
+
+Rows created by the create scenarios are deleted at the end, so the dataset
+stays the same between runs.
+"""
+import argparse
+import datetime
+import json
+import platform
+import random
+import subprocess
+import time
+
+from benchmarks.common import print_table, setup_django, summarize
+
+
+class Scenario:
+    """
+    One benchmarked request. `request(i)` sends the i-th request and returns the response;
+    `before()` runs untimed ahead of every request (e.g. to invalidate the cache).
+    """
+
+    def __init__(self, name, request, before=None, iterations=None, expected_status=200):
+        self.name = name
+        self.request = request
+        self.before = before
+        self.iterations = iterations
+        self.expected_status = expected_status
+
+
+def run_scenario(scenario: Scenario, iterations: int, warmup: int) -> dict:
+    """Latency statistics plus average SQL statements per request."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for i in range(warmup):
+        if scenario.before:
+            scenario.before()
+        scenario.request(i)
+
+    samples = []
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        for i in range(iterations):
+            if scenario.before:
+                scenario.before()
+            start = time.perf_counter()
+            response = scenario.request(warmup + i)
+            samples.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == scenario.expected_status, (scenario.name, response.status_code)
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+    stats = summarize(samples)
+    stats["queries_per_request"] = len(statements) / iterations
+    return stats
+
+
+def build_scenarios(client, per_page: int, heavy_iterations: int, created: dict):
+    """
+    The suite's scenarios, with ids and deep positions looked up from the seeded data,
+    and a description of that data (row counts, deep page numbers) for the report.
+    """
+    from sqlalchemy import func
+    from api.cache import POSTS_NAMESPACE, USERS_NAMESPACE, bump_generation
+    from api.models import Post, Session, User
+    from api.pagination import encode_cursor
+
+    rng = random.Random(0)
+    with Session() as db_session:
+        user_count = db_session.query(User).count()
+        post_count = db_session.query(Post).count()
+        if not user_count or not post_count:
+            raise SystemExit("No data to benchmark; run `python -m benchmarks.seed` first.")
+        user_ids = [row.id for row in db_session.query(User.id).order_by(User.id).limit(10_000)]
+        post_ids = [row.id for row in db_session.query(Post.id).order_by(Post.id).limit(10_000)]
+        busiest_author = (
+            db_session.query(Post.author_id).group_by(Post.author_id).order_by(func.count().desc(), Post.author_id)
+            .limit(1).scalar()
+        )
+
+        def position(model, offset):
+            row = (
+                db_session.query(model.created_at, model.id)
+                .order_by(model.created_at.desc(), model.id.desc())
+                .offset(offset).limit(1).one()
+            )
+            return encode_cursor("n", row.created_at, row.id)
+
+        deep_user_page = max(1, user_count // per_page // 2)
+        deep_post_page = max(1, post_count // per_page // 2)
+        deep_user_cursor = position(User, (deep_user_page - 1) * per_page - 1) if deep_user_page > 1 else ""
+        deep_post_cursor = position(Post, (deep_post_page - 1) * per_page - 1) if deep_post_page > 1 else ""
+
+    def get(path):
+        return lambda i: client.get(path)
+
+    def bump_users():
+        bump_generation(USERS_NAMESPACE)
+
+    def bump_posts():
+        bump_generation(POSTS_NAMESPACE)
+
+    def create_user(i):
+        response = client.post('/api/v1/users/', {
+            'username': f'bench_suite_{i}', 'email': f'bench_suite_{i}@example.com', 'password': 'password',
+        })
+        created['users'].append(response.json()['id'])
+        return response
+
+    def create_post(i):
+        response = client.post('/api/v1/posts/', {
+            'title': f'Benchmark post {i}', 'content': 'Benchmark content', 'author_id': rng.choice(user_ids),
+        })
+        created['posts'].append(response.json()['id'])
+        return response
+
+    page = f'per_page={per_page}'
+    return [
+        Scenario('users list (all rows)', get('/api/v1/users/'), iterations=heavy_iterations),
+        Scenario('users retrieve', lambda i: client.get(f'/api/v1/users/{rng.choice(user_ids)}/')),
+        Scenario('users create', create_user, expected_status=201),
+        Scenario('cached_users page 1 cached', get(f'/api/v1/cached_users/?{page}')),
+        Scenario('cached_users page 1 uncached', get(f'/api/v1/cached_users/?{page}'), before=bump_users),
+        Scenario('cached_users deep page uncached',
+                 get(f'/api/v1/cached_users/?page={deep_user_page}&{page}'), before=bump_users),
+        Scenario('cached_users deep cursor uncached',
+                 get(f'/api/v1/cached_users/?cursor={deep_user_cursor}&{page}'), before=bump_users),
+        Scenario('posts page 1 cached', get(f'/api/v1/posts/?{page}')),
+        Scenario('posts page 1 uncached', get(f'/api/v1/posts/?{page}'), before=bump_posts),
+        Scenario('posts page 1 uncached, id/title fields',
+                 get(f'/api/v1/posts/?fields=id,title,created_at&{page}'), before=bump_posts),
+        Scenario('posts deep page uncached',
+                 get(f'/api/v1/posts/?page={deep_post_page}&{page}'), before=bump_posts, iterations=heavy_iterations),
+        Scenario('posts first cursor page', get(f'/api/v1/posts/?cursor=&{page}')),
+        Scenario('posts deep cursor', get(f'/api/v1/posts/?cursor={deep_post_cursor}&{page}')),
+        Scenario('posts by author (cursor)', get(f'/api/v1/users/{busiest_author}/posts/?cursor=&{page}')),
+        Scenario('posts retrieve', lambda i: client.get(f'/api/v1/posts/{rng.choice(post_ids)}/')),
+        Scenario('posts create', create_post, expected_status=201),
+    ], {'users': user_count, 'posts': post_count, 'deep_user_page': deep_user_page, 'deep_post_page': deep_post_page}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict):
+    """Print p50/p95 and throughput changes against a baseline run."""
+    print(f"\n{'scenario':<36}{'p50':>18}{'p95':>18}{'ops/s':>16}{'queries':>12}")
+    for name, stats in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            print(f"{name:<36}{'(new)':>18}")
+            continue
+        cells = [
+            f"{before[key]:.2f}->{stats[key]:.2f}ms" for key in ('p50_ms', 'p95_ms')
+        ] + [f"{stats['ops_per_sec'] / before['ops_per_sec']:.2f}x" if before['ops_per_sec'] else 'n/a']
+        queries = f"{before['queries_per_request']:g}->{stats['queries_per_request']:g}"
+        print(f"{name:<36}{cells[0]:>18}{cells[1]:>18}{cells[2]:>16}{queries:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--heavy-iterations", type=int, default=10,
+                        help="Iterations for scenarios that read whole tables or deep OFFSETs.")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--only", help="Run only scenarios whose name contains this text.")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="Earlier --output file to compare against.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+    from api.cache import POSTS_NAMESPACE, USERS_NAMESPACE, bump_generation
+    from sqlalchemy import func
+    from api.dal import posts_count_update
+    from api.models import Post, Session, User, get_engine
+
+    client = Client()
+    created = {'users': [], 'posts': []}
+    scenarios, dataset = build_scenarios(client, args.per_page, args.heavy_iterations, created)
+    results = {}
+    try:
+        for scenario in scenarios:
+            if args.only and args.only not in scenario.name:
+                continue
+            iterations = scenario.iterations or args.iterations
+            results[scenario.name] = run_scenario(scenario, iterations, min(args.warmup, iterations))
+    finally:
+        with Session() as db_session:
+            # Give the authors of the created posts their counts back, in the same transaction
+            authors = (
+                db_session.query(Post.author_id, func.count()).filter(Post.id.in_(created['posts']))
+                .group_by(Post.author_id).all()
+            )
+            stmt = posts_count_update({author_id: -count for author_id, count in authors})
+            if stmt is not None:
+                db_session.execute(stmt)
+            db_session.query(Post).filter(Post.id.in_(created['posts'])).delete(synchronize_session=False)
+            db_session.query(User).filter(User.id.in_(created['users'])).delete(synchronize_session=False)
+            db_session.commit()
+        bump_generation(USERS_NAMESPACE, POSTS_NAMESPACE)
+
+    with get_engine().connect() as connection:
+        server_version = connection.exec_driver_sql("SHOW server_version").scalar()
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'postgres': server_version,
+            'dataset': dataset,
+            'per_page': args.per_page,
+            'iterations': args.iterations,
+            'heavy_iterations': args.heavy_iterations,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print_table(results)
+    print(f"\nwrote {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Production server settings.
+
+    gunicorn -c gunicorn.conf.py backend.wsgi
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn -c gunicorn.conf.py backend.asgi
+
+The app is preloaded in the master and workers are forked from it, so the
+import cost is paid once and the loaded modules are shared copy-on-write.
+api.prefork makes sure no database or Redis connection crosses the fork.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+threads = int(os.environ.get("GUNICORN_THREADS", "1"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))  # Seconds
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Workers write Prometheus values to files here and /metrics sums them (api/metrics.py).
+# Set before the app (and prometheus_client) is imported; emptied on every start.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "backend-prometheus"))
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+
+def when_ready(server):
+    # Runs in the master once the (preloaded) app is imported, before the first fork
+    if server.cfg.preload_app:
+        from api import prefork
+        prefork.warm_up()
+        prefork.freeze()
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        from api import prefork
+        prefork.reset_after_fork()
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges (pool occupancy); its counters keep counting
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
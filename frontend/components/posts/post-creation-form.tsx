@@ -51,6 +51,23 @@ const formSchema = z.object({
 // Type for form values inferred from the schema
 type FormValues = z.infer<typeof formSchema>;
 
+// How often and how many times to poll a queued post's ticket (write-behind mode)
+const TICKET_POLL_INTERVAL_MS = 1000;
+const TICKET_POLL_ATTEMPTS = 10;
+
+// Polls a ticket until the post is created or failed; returns the last status seen
+async function waitForTicket(ticket: string): Promise<any> {
+  let result: any = { ticket, status: "pending" };
+  for (let attempt = 0; attempt < TICKET_POLL_ATTEMPTS; attempt++) {
+    await new Promise((resolve) => setTimeout(resolve, TICKET_POLL_INTERVAL_MS));
+    result = await postApi.getPostTicket(ticket);
+    if (result.status !== "pending") {
+      break;
+    }
+  }
+  return result;
+}
+
 // Props interface for the PostCreationForm component
 interface PostCreationFormProps {
   onPostCreated: () => void;
@@ -148,21 +165,42 @@ export default function PostCreationForm({
         toast.success("Post has been updated successfully");
       } else {
         // Create new post
-        await postApi.createPost({
+        const created = await postApi.createPost({
           title: data.title,
           content: data.content,
           author_id: Number.parseInt(data.author_id), // Convert string to number
         });
 
+        // In write-behind mode the server answers 202 with a ticket and inserts the post shortly after
+        const ticket = created?.ticket
+          ? await waitForTicket(created.ticket)
+          : { status: "created" };
+
+        if (ticket.status === "failed") {
+          console.error("Queued post failed:", ticket.errors);
+          const errorMessage = "Invalid data provided. Please check your inputs.";
+          setFormStatus({ type: "error", message: errorMessage });
+          toast.error(errorMessage);
+          return;
+        }
+
+        const pending = ticket.status === "pending";
+
         setFormStatus({
           type: "success",
-          message: "Post created successfully!",
+          message: pending
+            ? "Post accepted! It will appear in the list in a moment."
+            : "Post created successfully!",
         });
 
         form.reset();
         onPostCreated();
 
-        toast.success("Post has been created successfully");
+        toast.success(
+          pending
+            ? "Post has been accepted and is being published"
+            : "Post has been created successfully"
+        );
       }
     } catch (error: any) {
       console.error("Post submission error:", error);
@@ -28,7 +28,7 @@ import {
 interface Post {
   id: number;
   title: string;
-  content: string;
+  excerpt: string; // Leading characters of the content; the full content comes from getPost
   user_id: number;
 }
 
@@ -56,6 +56,17 @@ export default function PostList({ refreshTrigger, onEditPost }: PostListProps)
     fetchPosts();
   }, [refreshTrigger]);
 
+  // Lists only carry an excerpt, so load the full post before editing it
+  const handleEditPost = async (postId: number) => {
+    try {
+      const post = await postApi.getPost(postId);
+      onEditPost({ id: post.id, title: post.title, content: post.content });
+    } catch (err) {
+      console.error(`Error loading post ${postId}:`, err);
+      toast.error("Failed to load the post");
+    }
+  };
+
   // Function to fetch posts from the API
   const fetchPosts = async () => {
     setIsLoading(true);
@@ -113,13 +124,7 @@ export default function PostList({ refreshTrigger, onEditPost }: PostListProps)
                       <Button
                         variant="ghost"
                         size="icon"
-                        onClick={() =>
-                          onEditPost({
-                            id: post.id,
-                            title: post.title,
-                            content: post.content,
-                          })
-                        }
+                        onClick={() => handleEditPost(post.id)}
                       >
                         <Pencil className="h-4 w-4 text-blue-500" />
                       </Button>
@@ -151,7 +156,7 @@ export default function PostList({ refreshTrigger, onEditPost }: PostListProps)
                   </div>
                 </CardHeader>
                 <CardContent>
-                  <p className="text-muted-foreground whitespace-pre-line">{post.content}</p>
+                  <p className="text-muted-foreground whitespace-pre-line">{post.excerpt}</p>
                 </CardContent>
               </Card>
             ))}
@@ -29,6 +29,7 @@ interface User {
   id: number;
   username: string;
   email: string;
+  posts_count: number; // Stored on the user row, so listing users never counts posts
 }
 
 // Props interface for the UserList component
@@ -106,7 +107,9 @@ export default function UserList({ refreshTrigger }: UserListProps) {
               <div key={user.id} className="py-4 flex justify-between items-center">
                 <div>
                   <h3 className="font-medium">{user.username}</h3>
-                  <p className="text-sm text-muted-foreground">{user.email}</p>
+                  <p className="text-sm text-muted-foreground">
+                    {user.email} · {user.posts_count} {user.posts_count === 1 ? "post" : "posts"}
+                  </p>
                 </div>
                 <AlertDialog>
                   <AlertDialogTrigger asChild>
@@ -6,6 +6,7 @@ const api: AxiosInstance = axios.create({
   headers: {
     "Content-Type": "application/json", // Set default content type
   },
+  withCredentials: true, // Send cookies cross-origin (keeps reads on the primary after a write)
 });
 
 // --- User API Calls ---
@@ -64,23 +65,44 @@ export const userApi = {
 
 export const postApi = {
   /**
-   * Fetches a list of posts from the API.
+   * Fetches one page of posts from the API.
+   * @param {number} page - The 1-based page number to fetch.
+   * @param {number} perPage - Number of posts per page (capped by the server).
    * @returns {Promise<any[]>} A promise that resolves to an array of post objects.
    */
-  getPosts: async (): Promise<any[]> => {
+  getPosts: async (page: number = 1, perPage: number = 10): Promise<any[]> => {
     try {
-      const response: AxiosResponse<any[]> = await api.get("/posts/");
-      return response.data;
+      const response: AxiosResponse<{ results: any[] }> = await api.get(
+        "/posts/",
+        { params: { page, per_page: perPage } }
+      );
+      return response.data.results;
     } catch (error) {
       console.error("Error fetching posts:", error);
       throw error;
     }
   },
 
+  /**
+   * Fetches a single post, including its full content (lists only carry an excerpt).
+   * @param {number} postId - The ID of the post to fetch.
+   * @returns {Promise<any>} A promise that resolves to the post object.
+   */
+  getPost: async (postId: number): Promise<any> => {
+    try {
+      const response: AxiosResponse<any> = await api.get(`/posts/${postId}/`);
+      return response.data;
+    } catch (error) {
+      console.error(`Error fetching post ${postId}:`, error);
+      throw error;
+    }
+  },
+
   /**
    * Creates a new post with the provided data.
    * @param {object} postData - Post data (title, content, author_id).
-   * @returns {Promise<any>} A promise that resolves to the created post object.
+   * @returns {Promise<any>} A promise that resolves to the created post object, or to
+   * { ticket, status: "pending" } when the server queues posts (write-behind mode).
    */
   createPost: async (postData: {
     title: string;
@@ -96,6 +118,21 @@ export const postApi = {
     }
   },
 
+  /**
+   * Fetches the status of a post queued in write-behind mode (202 from createPost).
+   * @param {string} ticket - The ticket returned when the post was accepted.
+   * @returns {Promise<any>} A promise that resolves to { ticket, status, id?, errors? }.
+   */
+  getPostTicket: async (ticket: string): Promise<any> => {
+    try {
+      const response: AxiosResponse<any> = await api.get(`/posts/tickets/${ticket}/`);
+      return response.data;
+    } catch (error) {
+      console.error(`Error fetching post ticket ${ticket}:`, error);
+      throw error;
+    }
+  },
+
   /**
    * Updates an existing post with the specified ID and data.
    * @param {number} postId - The ID of the post to update.